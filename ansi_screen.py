@@ -0,0 +1,94 @@
+import curses
+import os
+import sys
+
+
+# Symbols of curses alternative character set, used for borders, as Unicode box drawing
+ALTERNATIVE_SYMBOLS = str.maketrans({
+    'x': '│',
+    'q': '─',
+    'l': '┌',
+    'k': '┐',
+    'm': '└',
+    'j': '┘',
+})
+SGR_CODES = (
+    (curses.A_BOLD, '1'),
+    (curses.A_DIM, '2'),
+    (curses.A_UNDERLINE, '4'),
+    (curses.A_BLINK, '5'),
+    (curses.A_REVERSE, '7'),
+    (curses.A_STANDOUT, '7'),
+)
+
+
+def get_sgr_sequence(attributes):
+    """Return escape sequence switching the terminal to given curses attributes."""
+
+    codes = ['0']
+    for attribute, code in SGR_CODES:
+        if attributes & attribute and code not in codes:
+            codes.append(code)
+    return f'\x1b[{";".join(codes)}m'.encode()
+
+
+class AnsiWindow:
+    """Output backend writing ANSI escape sequences to the terminal directly, instead of curses calls.
+
+    Drawing calls are collected into one reusable bytearray, refresh()
+    flushes it with a single os.write(). Cursor is moved only when the text
+    doesn't continue right where the previous one ended, and attributes
+    are switched only when they change. Curses window is kept for the input
+    and the terminal setup, nothing is drawn through it.
+    """
+
+    def __init__(self, window, fd=None):
+        self.window = window
+        self.fd = sys.stdout.fileno() if fd is None else fd
+        self.rows_number, self.columns_number = window.getmaxyx()
+        self.begin_row, self.begin_column = window.getbegyx()
+        self._output = bytearray()
+        self._output_length = 0
+        self._cursor = None
+        self._attributes = None
+        self._sgr_sequences = {}
+        # Let curses clear the screen now, so it has nothing to redraw on getch() later
+        window.refresh()
+
+    def getmaxyx(self):
+        return self.rows_number, self.columns_number
+
+    def getch(self):
+        return self.window.getch()
+
+    def nodelay(self, flag):
+        self.window.nodelay(flag)
+
+    def _write(self, data):
+        # Slice assignment of the same length overwrites the bytes in place,
+        # so the buffer grows only until it fits the largest frame
+        end = self._output_length + len(data)
+        self._output[self._output_length:end] = data
+        self._output_length = end
+
+    def addstr(self, row, column, text, attributes=0):
+        if self._cursor != (row, column):
+            self._write(b'\x1b[%d;%dH' % (self.begin_row + row + 1, self.begin_column + column + 1))
+        if attributes != self._attributes:
+            sgr_sequence = self._sgr_sequences.get(attributes)
+            if sgr_sequence is None:
+                sgr_sequence = self._sgr_sequences[attributes] = get_sgr_sequence(attributes)
+            self._write(sgr_sequence)
+            self._attributes = attributes
+        if attributes & curses.A_ALTCHARSET:
+            text = text.translate(ALTERNATIVE_SYMBOLS)
+        self._write(text.encode())
+        self._cursor = (row, column + len(text))
+
+    def refresh(self):
+        written = 0
+        with memoryview(self._output) as output:
+            while written < self._output_length:
+                with output[written:self._output_length] as unwritten_output:
+                    written += os.write(self.fd, unwritten_output)
+        self._output_length = 0
@@ -0,0 +1,116 @@
+"""Recording of the game screen to asciicast v2 file, to watch it later with asciinema player.
+
+Recorder is a frame buffer observer: on every refresh it takes changed
+runs of the screen and hands them to a writer thread through a bounded
+queue, so the game loop never waits for the disk. If the writer falls
+behind, frames are dropped, and the next frame recorded is the whole
+screen, so the record stays consistent.
+"""
+import bz2
+import curses
+import gzip
+import json
+import lzma
+import os
+import queue
+import threading
+import time
+
+from ansi_screen import ALTERNATIVE_SYMBOLS, get_sgr_sequence
+
+
+QUEUE_SIZE = 100
+CLEAR_SCREEN = '\x1b[?25l\x1b[2J'
+OPENERS_BY_EXTENSION = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+
+def open_record(path):
+    """Open text file for writing, compressed according to its extension."""
+
+    _, extension = os.path.splitext(path)
+    opener = OPENERS_BY_EXTENSION.get(extension, open)
+    return opener(path, 'wt', encoding='utf-8')
+
+
+def encode_runs(runs, prefix=''):
+    """Return ANSI escape sequences drawing (row, column, text, attributes) runs."""
+
+    chunks = [prefix]
+    cursor = None
+    current_attributes = None
+    for row, column, text, attributes in runs:
+        if cursor != (row, column):
+            chunks.append(f'\x1b[{row + 1};{column + 1}H')
+        if attributes != current_attributes:
+            chunks.append(get_sgr_sequence(attributes).decode())
+            current_attributes = attributes
+        if attributes & curses.A_ALTCHARSET:
+            text = text.translate(ALTERNATIVE_SYMBOLS)
+        chunks.append(text)
+        cursor = (row, column + len(text))
+    return ''.join(chunks)
+
+
+class AsciicastRecorder:
+    """Frame buffer observer, writing every refresh as an output event of asciicast v2 file.
+
+    Call close() at the end of the game to write the rest of the queue.
+    """
+
+    def __init__(self, path, queue_size=QUEUE_SIZE, clock=time.monotonic):
+        self.path = path
+        self._clock = clock
+        self._queue = queue.Queue(queue_size)
+        self._started_at = None
+        self._needs_keyframe = True
+        self.dropped_frames = 0
+        self._writer = threading.Thread(target=self._write_events, daemon=True)
+        self._writer.start()
+
+    def __call__(self, frame_buffer, runs):
+        now = self._clock()
+        if self._started_at is None:
+            self._started_at = now
+            header = {
+                'version': 2,
+                'width': frame_buffer.columns_number,
+                'height': frame_buffer.rows_number,
+                'timestamp': int(time.time()),
+                'env': {'TERM': os.environ.get('TERM', '')},
+            }
+            self._queue.put(header)
+
+        if self._needs_keyframe:
+            prefix, runs = CLEAR_SCREEN, frame_buffer.get_shown_runs()
+        elif runs:
+            prefix = ''
+        else:
+            return
+        try:
+            self._queue.put_nowait((now - self._started_at, prefix, runs))
+        except queue.Full:
+            self.dropped_frames += 1
+            self._needs_keyframe = True
+        else:
+            self._needs_keyframe = False
+
+    def _write_events(self):
+        with open_record(self.path) as record_file:
+            while True:
+                event = self._queue.get()
+                if event is None:
+                    return
+                if isinstance(event, dict):
+                    record_file.write(json.dumps(event) + '\n')
+                    continue
+                elapsed, prefix, runs = event
+                output = encode_runs(runs, prefix)
+                record_file.write(json.dumps([round(elapsed, 6), 'o', output]) + '\n')
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join()
@@ -0,0 +1,133 @@
+"""Asset bundle, packing all frames into one file.
+
+Bundle starts with MAGIC and size of JSON index, mapping frame names to
+(offset, length) of their UTF-8 text in data following the index. Frame name
+is a path of the frame file inside frames directory without extension,
+e.g. 'rocket_frames/rocket_frame_1'.
+
+Build the bundle after changing frames:
+    python3 assets.py
+Without the bundle, or if frames directory changed after the bundle was
+built, frames directory is packed in memory at startup.
+"""
+import json
+import os
+import struct
+
+from curses_tools import Sprite
+
+
+FRAMES_DIR = 'frames'
+BUNDLE_PATH = 'frames.bundle'
+FRAME_EXTENSION = '.txt'
+MAGIC = b'SFGASSETS1'
+INDEX_SIZE_FORMAT = '<I'
+
+
+def pack_frames(frames_dir=FRAMES_DIR):
+    """Pack all frame files from a directory into bundle bytes."""
+
+    index = {}
+    data = bytearray()
+    for directory, subdirectories, files in os.walk(frames_dir):
+        subdirectories.sort()
+        for file in sorted(files):
+            if not file.endswith(FRAME_EXTENSION):
+                continue
+            path = os.path.join(directory, file)
+            name = os.path.relpath(path, frames_dir)[:-len(FRAME_EXTENSION)].replace(os.sep, '/')
+            with open(path, 'rb') as frame_file:
+                frame = frame_file.read()
+            index[name] = (len(data), len(frame))
+            data += frame
+
+    index_bytes = json.dumps(index, separators=(',', ':')).encode()
+    return MAGIC + struct.pack(INDEX_SIZE_FORMAT, len(index_bytes)) + index_bytes + data
+
+
+def get_frames_mtime(frames_dir=FRAMES_DIR):
+    """Return the latest modification time of frame files and directories, None without frames directory."""
+
+    mtimes = []
+    for directory, _, files in os.walk(frames_dir):
+        # Directory mtime changes when frame files are added, removed or renamed
+        mtimes.append(os.path.getmtime(directory))
+        mtimes.extend(
+            os.path.getmtime(os.path.join(directory, file))
+            for file in files
+            if file.endswith(FRAME_EXTENSION)
+        )
+    return max(mtimes, default=None)
+
+
+def build_bundle(frames_dir=FRAMES_DIR, bundle_path=BUNDLE_PATH):
+    with open(bundle_path, 'wb') as bundle_file:
+        bundle_file.write(pack_frames(frames_dir))
+
+
+class AssetBundle:
+    """Frames of a bundle, decoded into sprites on first request and cached."""
+
+    def __init__(self, bundle, source=BUNDLE_PATH):
+        self.source = source
+        if not bundle.startswith(MAGIC):
+            raise ValueError('Not an asset bundle.')
+
+        index_start = len(MAGIC) + struct.calcsize(INDEX_SIZE_FORMAT)
+        index_size, = struct.unpack_from(INDEX_SIZE_FORMAT, bundle, len(MAGIC))
+        self.index = json.loads(bytes(bundle[index_start:index_start + index_size]))
+        self._data = memoryview(bundle)[index_start + index_size:]
+        self._sprites = {}
+
+    @classmethod
+    def load(cls, bundle_path=BUNDLE_PATH, frames_dir=FRAMES_DIR):
+        """Read bundle file at once, or pack frames directory if there is no bundle or it is stale."""
+
+        try:
+            bundle_mtime = os.path.getmtime(bundle_path)
+        except FileNotFoundError:
+            return cls(pack_frames(frames_dir), source=frames_dir)
+
+        frames_mtime = get_frames_mtime(frames_dir)
+        if frames_mtime is not None and frames_mtime > bundle_mtime:
+            return cls(pack_frames(frames_dir), source=frames_dir)
+        with open(bundle_path, 'rb') as bundle_file:
+            return cls(bundle_file.read(), source=bundle_path)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def get_text(self, name):
+        try:
+            offset, length = self.index[name]
+        except KeyError:
+            hint = '' if self.source == FRAMES_DIR else ', rebuild the bundle if frames changed: python3 assets.py'
+            raise KeyError(f'No frame {name!r} in {self.source}{hint}') from None
+        return str(self._data[offset:offset + length], 'utf-8')
+
+    def get_sprite(self, name):
+        sprite = self._sprites.get(name)
+        if sprite is None:
+            sprite = self._sprites[name] = Sprite(self.get_text(name))
+        return sprite
+
+
+_bundle = None
+
+
+def get_bundle():
+    global _bundle
+    if _bundle is None:
+        _bundle = AssetBundle.load()
+    return _bundle
+
+
+def load_sprite(name):
+    """Return sprite of a frame by its name, e.g. 'garbage_frames/duck'."""
+
+    return get_bundle().get_sprite(name)
+
+
+if __name__ == '__main__':
+    build_bundle()
+    print(f'{len(get_bundle().index)} frames packed into {BUNDLE_PATH}')
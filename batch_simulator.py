@@ -0,0 +1,112 @@
+"""Play lots of headless games in parallel, to tune the difficulty curve.
+
+Every game gets its own seed, results are written to CSV file as soon as
+workers finish the games.
+
+Usage:
+    python3 batch_simulator.py --games 1000 --pilot random --output results.csv
+"""
+import argparse
+import csv
+import multiprocessing
+import random
+import statistics
+import time
+
+from game_scenario import DEFAULT_SCENARIO_PATH
+from headless import PILOTS, run_headless
+
+
+RESULT_FIELDS = (
+    'seed',
+    'pilot',
+    'tics',
+    'year',
+    'game_over',
+    'shots_fired',
+    'obstacles_destroyed',
+    'peak_obstacles',
+)
+FLUSH_EVERY_RESULTS = 100
+
+
+def play_game(task):
+    """Play one game until game over or max tics. Return dict with its results."""
+
+    seed, pilot, max_tics, rows_number, columns_number, scenario_path = task
+    stats = run_headless(
+        max_tics,
+        rows_number,
+        columns_number,
+        keys=PILOTS[pilot](random.Random(f'pilot-{seed}')),
+        seed=seed,
+        until_game_over=True,
+        scenario_path=scenario_path,
+    )
+    stats['seed'] = seed
+    stats['pilot'] = pilot
+    stats['game_over'] = int(stats['game_over'])
+    return {field: stats[field] for field in RESULT_FIELDS}
+
+
+def run_batch(output_path, games, pilot='random', max_tics=20000, rows_number=50, columns_number=180,
+              first_seed=0, workers=None, chunksize=4, scenario_path=DEFAULT_SCENARIO_PATH):
+    """Play games in a pool of processes, streaming results to CSV file. Return list of results."""
+
+    tasks = (
+        (seed, pilot, max_tics, rows_number, columns_number, scenario_path)
+        for seed in range(first_seed, first_seed + games)
+    )
+    results = []
+    with multiprocessing.Pool(workers) as pool, open(output_path, 'w', newline='') as results_file:
+        writer = csv.DictWriter(results_file, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        for result in pool.imap_unordered(play_game, tasks, chunksize=chunksize):
+            writer.writerow(result)
+            results.append(result)
+            if len(results) % FLUSH_EVERY_RESULTS == 0:
+                results_file.flush()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play lots of headless games in parallel.')
+    parser.add_argument('--games', type=int, default=100, help='amount of games to play')
+    parser.add_argument('--pilot', choices=PILOTS, default='random', help='scripted input')
+    parser.add_argument('--max-tics', type=int, default=20000, help='stop the game after this amount of tics')
+    parser.add_argument('--rows', type=int, default=50, help='fake terminal height')
+    parser.add_argument('--columns', type=int, default=180, help='fake terminal width')
+    parser.add_argument('--first-seed', type=int, default=0, help='seed of the first game, next ones get next seeds')
+    parser.add_argument('--scenario', default=DEFAULT_SCENARIO_PATH, metavar='PATH', help='scenario JSON file')
+    parser.add_argument('--workers', type=int, help='amount of processes, all CPU cores by default')
+    parser.add_argument('--output', default='results.csv', help='CSV file for results')
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    results = run_batch(
+        args.output,
+        args.games,
+        pilot=args.pilot,
+        max_tics=args.max_tics,
+        rows_number=args.rows,
+        columns_number=args.columns,
+        first_seed=args.first_seed,
+        workers=args.workers,
+        scenario_path=args.scenario,
+    )
+    elapsed = time.perf_counter() - started_at
+
+    total_tics = sum(result['tics'] for result in results)
+    years = [result['year'] for result in results]
+    print(
+        f'{len(results)} games in {elapsed:.1f} s: {len(results) / elapsed:.1f} games, '
+        f'{total_tics / elapsed:.0f} tics per second, processes: {args.workers or multiprocessing.cpu_count()}'
+    )
+    print(
+        f'survival year: mean {statistics.mean(years):.1f}, median {statistics.median(years)}, '
+        f'min {min(years)}, max {max(years)}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,305 @@
+"""Benchmark suite for code running every tic.
+
+Run from the project directory:
+    python3 -m benchmarks --output results.json
+    python3 -m benchmarks --compare results.json
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+from array import array
+from itertools import count
+
+import main
+import obstacles
+from assets import load_sprite
+from curses_tools import draw_frame, get_frame_size
+from frame_buffer import FrameBuffer
+from game_scenario import Scenario, SpawnTimeline
+from headless import FakeCanvas
+from particles import BURST_SIZE, ParticleSystem
+from physics import update_speed, update_speeds
+from starfield import StarField, blink_stars
+from viewport import Viewport
+
+
+SCREEN_ROWS = 50
+SCREEN_COLUMNS = 180
+REPEATS = 5
+
+
+class NullCanvas:
+    """Canvas ignoring everything drawn on it, to measure drawing code alone."""
+
+    def getmaxyx(self):
+        return SCREEN_ROWS, SCREEN_COLUMNS
+
+    def addch(self, *args):
+        pass
+
+    def addstr(self, *args):
+        pass
+
+
+def get_draw_frame_cases():
+    canvas = NullCanvas()
+    small_sprite = load_sprite('garbage_frames/lamp')
+    large_sprite = load_sprite('garbage_frames/hubble')
+    for size, sprite in (('small', small_sprite), ('large', large_sprite)):
+        yield f'draw_frame.{size}.draw', lambda sprite=sprite: draw_frame(canvas, 10, 10, sprite)
+        yield f'draw_frame.{size}.erase', lambda sprite=sprite: draw_frame(canvas, 10, 10, sprite, negative=True)
+        yield f'draw_frame.{size}.clipped', lambda sprite=sprite: draw_frame(
+            canvas, SCREEN_ROWS - 2, SCREEN_COLUMNS - 3, sprite
+        )
+    yield 'draw_frame.text', lambda: draw_frame(canvas, 10, 10, '2020 - Take the plasma gun!')
+
+
+def get_collision_cases():
+    obstacle = obstacles.Obstacle(10, 10, 6, 20)
+    yield 'has_collision.hit', lambda: obstacles.has_collision((10, 10), (6, 20), (12.5, 15))
+    yield 'has_collision.miss', lambda: obstacles.has_collision((10, 10), (6, 20), (30.5, 15))
+    yield 'Obstacle.has_collision', lambda: obstacle.has_collision(12.5, 15)
+
+    rocket_mask = obstacles.CollisionMask(load_sprite('rocket_frames/rocket_frame_1'))
+    hubble_mask = obstacles.CollisionMask(load_sprite('garbage_frames/hubble'))
+    yield 'CollisionMask.overlaps.hit', lambda: hubble_mask.overlaps(10, 10, rocket_mask, 12.5, 15)
+    yield 'CollisionMask.overlaps.miss', lambda: hubble_mask.overlaps(10, 10, rocket_mask, 10, 0)
+    yield 'CollisionMask.has_point', lambda: hubble_mask.has_point(3, 5)
+
+    store = obstacles.ObstacleStore()
+    store.masks[0] = hubble_mask
+    rng = random.Random(0)
+    for _ in range(50):
+        store.add(
+            rng.uniform(0, SCREEN_ROWS),
+            rng.randint(0, SCREEN_COLUMNS),
+            hubble_mask.rows_number,
+            hubble_mask.columns_number,
+        )
+    yield 'ObstacleStore.get_collided_obstacles', lambda: store.get_collided_obstacles(rocket_mask, 20, 90)
+    yield 'ObstacleStore.collide_points.20', lambda: store.collide_points(
+        [(SCREEN_ROWS / 2, column) for column in range(0, SCREEN_COLUMNS, 9)]
+    )
+
+
+def get_physics_cases():
+    yield 'update_speed.accelerate', lambda: update_speed(1.2, -0.7, 1, -1, 3, 3)
+    yield 'update_speed.fade', lambda: update_speed(1.2, -0.7, 0, 0, 3, 3)
+
+    ships_amount = 1000
+    rng = random.Random(0)
+    rows_directions = [rng.choice((-1, 0, 1)) for _ in range(ships_amount)]
+    columns_directions = [rng.choice((-1, 0, 1)) for _ in range(ships_amount)]
+    row_speeds = array('d', [0]) * ships_amount
+    column_speeds = array('d', [0]) * ships_amount
+
+    def update_one_by_one():
+        for ship, (row_speed, column_speed) in enumerate(zip(row_speeds, column_speeds)):
+            row_speeds[ship], column_speeds[ship] = update_speed(
+                row_speed, column_speed, rows_directions[ship], columns_directions[ship], 3, 3,
+            )
+
+    yield f'update_speed.ships_{ships_amount}', update_one_by_one
+    yield f'update_speeds.ships_{ships_amount}', lambda: update_speeds(
+        row_speeds, column_speeds, rows_directions, columns_directions, 3, 3,
+    )
+
+
+def get_scenario_cases():
+    scenario = Scenario.load()
+    frames_columns_sizes = [
+        get_frame_size(load_sprite(f'garbage_frames/{name}'))[1]
+        for name in scenario.frame_names
+    ]
+    spawn_timeline = iter(SpawnTimeline(scenario, frames_columns_sizes, SCREEN_COLUMNS * 8 - 2, world_screens=8, seed=0))
+    yield 'SpawnTimeline.next.world_8', lambda: next(spawn_timeline)
+
+
+def get_star_field_cases():
+    rows_number, columns_number = 200, 600
+    for stars_amount in (100, 10000):
+        frame_buffer = FrameBuffer(FakeCanvas(rows_number, columns_number))
+        star_field = StarField.generate(random.Random(0), rows_number, columns_number, amount=stars_amount)
+        tics = count()
+        yield f'StarField.update.stars_{stars_amount}', lambda star_field=star_field, frame_buffer=frame_buffer, tics=tics: (
+            star_field.update(frame_buffer, next(tics))
+        )
+
+
+def get_particle_cases():
+    for explosions_amount in (1, 25, 100):
+        frame_buffer = FrameBuffer(FakeCanvas(SCREEN_ROWS, SCREEN_COLUMNS))
+        particles = ParticleSystem(rng=random.Random(0))
+
+        def emit_and_update(particles=particles, frame_buffer=frame_buffer, explosions_amount=explosions_amount):
+            # Keep the amount of live particles steady, as if explosions happened every few tics
+            if len(particles) < explosions_amount * BURST_SIZE // 2:
+                rng = particles.rng
+                for _ in range(explosions_amount):
+                    particles.emit_burst(rng.uniform(5, SCREEN_ROWS - 5), rng.uniform(10, SCREEN_COLUMNS - 10))
+            particles.update(frame_buffer)
+            frame_buffer.finish_tic()
+
+        yield f'ParticleSystem.update.explosions_{explosions_amount}', emit_and_update
+
+
+def get_tic_case(stars_amount, garbage_amount, shots_amount, world_screens=1):
+    """Return setup and tic functions of a game with given amount of objects spread over the world."""
+
+    def setup():
+        rng = random.Random(0)
+        if hasattr(main, 'scheduler'):
+            main.scheduler.close()
+        main.reset_game_state()
+        main.current_year = 2020
+        canvas = FrameBuffer(FakeCanvas(SCREEN_ROWS, SCREEN_COLUMNS))
+        viewport = Viewport(canvas, SCREEN_COLUMNS * world_screens)
+        state['canvas'], state['viewport'] = canvas, viewport
+
+        star_field = StarField.generate(rng, SCREEN_ROWS, SCREEN_COLUMNS, amount=stars_amount)
+        main.scheduler.spawn(blink_stars(canvas, star_field))
+        for _ in range(garbage_amount):
+            frame_id = rng.randrange(len(garbage_frames))
+            rows_size, columns_size = get_frame_size(garbage_frames[frame_id])
+            main.obstacles.add(
+                row=rng.uniform(-5, SCREEN_ROWS / 2),
+                column=rng.randint(1, SCREEN_COLUMNS * world_screens - 25),
+                rows_size=rows_size,
+                columns_size=columns_size,
+                speed=rng.uniform(0.1, 0.5),
+                frame_id=frame_id,
+            )
+        main.scheduler.spawn(main.fly_garbage(viewport, garbage_frames))
+        main.scheduler.spawn(main.fly_shots(viewport))
+        for _ in range(shots_amount):
+            main.projectiles.launch(
+                SCREEN_ROWS - 2,
+                rng.randint(1, SCREEN_COLUMNS * world_screens - 2),
+                rows_speed=-rng.uniform(0.3, 0.8),
+            )
+
+    def run_tic():
+        canvas = state['canvas']
+        # Viewport stays in the world middle, as the rocket flying there would keep it
+        state['viewport'].follow(SCREEN_COLUMNS * world_screens / 2)
+        main.scheduler.run_tic()
+        canvas.finish_tic()
+        canvas.border()
+        canvas.refresh()
+
+    state = {}
+    garbage_frames = [
+        load_sprite(f'garbage_frames/{name}')
+        for name in ('duck', 'hubble', 'lamp', 'trash_large', 'trash_small', 'trash_xl')
+    ]
+    return setup, run_tic
+
+
+def get_tic_cases():
+    for stars_amount, garbage_amount, shots_amount in ((100, 10, 5), (100, 50, 20), (1000, 200, 100), (100, 50, 500)):
+        setup, run_tic = get_tic_case(stars_amount, garbage_amount, shots_amount)
+        yield f'tic.stars_{stars_amount}.garbage_{garbage_amount}.shots_{shots_amount}', run_tic, setup
+
+    # Same amount of garbage per screen, as in the case above, but in the world of 8 screens
+    setup, run_tic = get_tic_case(100, 400, 20, world_screens=8)
+    yield 'tic.stars_100.garbage_400.shots_20.world_8', run_tic, setup
+
+
+def measure(function, setup=None, number=None):
+    """Return timings of a single call in microseconds."""
+
+    timer = timeit.Timer(function, setup=setup or 'pass')
+    if number is None:
+        number, _ = timer.autorange()
+    timings = sorted(
+        timing / number * 1e6
+        for timing in timer.repeat(repeat=REPEATS, number=number)
+    )
+    return {
+        'min_us': timings[0],
+        'median_us': statistics.median(timings),
+        'number': number,
+        'repeats': REPEATS,
+    }
+
+
+def get_git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(name_filter=''):
+    results = {}
+    micro_cases = [
+        *get_draw_frame_cases(),
+        *get_collision_cases(),
+        *get_physics_cases(),
+        *get_scenario_cases(),
+        *get_star_field_cases(),
+        *get_particle_cases(),
+    ]
+    for name, function in micro_cases:
+        if name_filter in name:
+            results[name] = measure(function)
+
+    # Each repeat starts a fresh game, so the same tics are measured every time
+    for name, run_tic, setup in get_tic_cases():
+        if name_filter in name:
+            results[name] = measure(run_tic, setup=setup, number=50)
+    if hasattr(main, 'scheduler'):
+        main.scheduler.close()
+
+    return {
+        'revision': get_git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def print_results(report, baseline=None):
+    baseline_results = baseline['results'] if baseline else {}
+    for name, result in report['results'].items():
+        line = f'{name:<45} {result["min_us"]:>12.2f} us {result["median_us"]:>12.2f} us'
+        if name in baseline_results:
+            ratio = result['min_us'] / baseline_results[name]['min_us']
+            line += f' {ratio:>7.2f}x'
+        print(line)
+
+
+def main_benchmarks():
+    parser = argparse.ArgumentParser(description='Measure per tic hot paths of the game.')
+    parser.add_argument('--output', help='save results to JSON file')
+    parser.add_argument('--compare', help='JSON file with results to compare with')
+    parser.add_argument('--filter', default='', help='run only benchmarks with names containing this text')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as baseline_file:
+            baseline = json.load(baseline_file)
+
+    report = run_benchmarks(args.filter)
+
+    print(f'{"benchmark":<45} {"min":>15} {"median":>15}', file=sys.stderr)
+    print_results(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main_benchmarks()
@@ -0,0 +1,92 @@
+"""Compare time and terminal output of rendering the game through curses and raw ANSI backend.
+
+Every backend plays the same game in a pseudo-terminal. Run from the project directory:
+    python3 -m benchmarks.ansi_backend
+"""
+import curses
+import fcntl
+import json
+import os
+import pty
+import statistics
+import struct
+import termios
+import time
+
+import main
+from ansi_screen import AnsiWindow
+from frame_buffer import FrameBuffer
+from replay import ControlsReplayer
+
+
+SCREEN_ROWS = 50
+SCREEN_COLUMNS = 180
+TICS_AMOUNT = 150
+BACKENDS = ('curses', 'ansi')
+
+
+def play(window, backend):
+    """Play the game without input, return refresh times in microseconds."""
+
+    curses.curs_set(False)
+    window.nodelay(True)
+    if backend == 'ansi':
+        window = AnsiWindow(window)
+    canvas = FrameBuffer(window)
+    main.reset_game_state(seed=0)
+    main.start_game(canvas, ControlsReplayer(()))
+
+    refresh_times = []
+    for _ in range(TICS_AMOUNT):
+        main.scheduler.run_tic()
+        canvas.finish_tic()
+        canvas.border()
+        started_at = time.perf_counter()
+        canvas.refresh()
+        refresh_times.append((time.perf_counter() - started_at) * 1e6)
+    main.scheduler.close()
+    return refresh_times
+
+
+def measure(backend):
+    """Play the game in a pseudo-terminal. Return refresh times and amount of bytes sent to the terminal."""
+
+    results_fd, child_results_fd = os.pipe()
+    pid, terminal_fd = pty.fork()
+    if pid == 0:
+        os.close(results_fd)
+        refresh_times = curses.wrapper(play, backend)
+        os.write(child_results_fd, json.dumps(refresh_times).encode())
+        os._exit(0)
+
+    os.close(child_results_fd)
+    fcntl.ioctl(terminal_fd, termios.TIOCSWINSZ, struct.pack('HHHH', SCREEN_ROWS, SCREEN_COLUMNS, 0, 0))
+    output_bytes = 0
+    while True:
+        try:
+            output = os.read(terminal_fd, 65536)
+        except OSError:
+            # Linux raises EIO once the child closes the terminal
+            break
+        if not output:
+            break
+        output_bytes += len(output)
+    os.waitpid(pid, 0)
+
+    with os.fdopen(results_fd, 'rb') as results_file:
+        return json.loads(results_file.read()), output_bytes
+
+
+def main_benchmark():
+    print(f'{TICS_AMOUNT} tics on {SCREEN_ROWS}x{SCREEN_COLUMNS} screen')
+    print(f'{"backend":10}{"mean refresh":>16}{"max refresh":>16}{"terminal output":>18}')
+    for backend in BACKENDS:
+        refresh_times, output_bytes = measure(backend)
+        print(
+            f'{backend:10}{statistics.mean(refresh_times):13.0f} us{max(refresh_times):13.0f} us'
+            f'{output_bytes / 1024:15.0f} KB'
+        )
+
+
+if __name__ == '__main__':
+    main_benchmark()
@@ -0,0 +1,138 @@
+"""Count curses calls per tic made by direct drawing and through FrameBuffer.
+
+Direct drawing is the way the game drew before the frame buffer: symbol by
+symbol with addch, so the baseline doesn't follow later drawing changes.
+
+Run from the project directory:
+    python3 -m benchmarks.frame_buffer
+"""
+import curses
+import random
+
+from assets import load_sprite
+from curses_tools import draw_frame, get_frame_size
+from frame_buffer import FrameBuffer
+from scheduler import Scheduler, sleep
+from starfield import StarField, blink_stars
+
+
+SCREEN_ROWS = 50
+SCREEN_COLUMNS = 180
+STARS_AMOUNT = 100
+GARBAGE_AMOUNT = 50
+TICS_AMOUNT = 300
+GARBAGE_FRAME_NAMES = (
+    'duck',
+    'hubble',
+    'lamp',
+    'trash_large',
+    'trash_small',
+    'trash_xl',
+)
+
+
+class CountingWindow:
+    """Curses window stand-in which only counts drawing calls."""
+
+    def __init__(self, rows_number, columns_number):
+        self.rows_number = rows_number
+        self.columns_number = columns_number
+        self.calls = 0
+
+    def getmaxyx(self):
+        return self.rows_number, self.columns_number
+
+    def addch(self, *args):
+        self.calls += 1
+
+    def addstr(self, *args):
+        self.calls += 1
+
+    def refresh(self):
+        pass
+
+
+async def blink(canvas, row, column, offset_tics, symbol):
+    """Blink a star drawing it right on the canvas, as every star was drawn before the frame buffer."""
+
+    while True:
+        canvas.addstr(row, column, symbol, curses.A_DIM)
+        await sleep(20 + offset_tics)
+        canvas.addstr(row, column, symbol)
+        await sleep(3)
+        canvas.addstr(row, column, symbol, curses.A_BOLD)
+        await sleep(5)
+        canvas.addstr(row, column, symbol)
+        await sleep(3)
+
+
+def draw_frame_by_symbols(canvas, start_row, start_column, sprite, negative=False):
+    """Draw sprite one addch call per symbol, as draw_frame did before the frame buffer."""
+
+    rows_number, columns_number = canvas.getmaxyx()
+    start_row, start_column = round(start_row), round(start_column)
+    for sprite_row, sprite_column, symbol in sprite.cells:
+        row, column = start_row + sprite_row, start_column + sprite_column
+        if not (0 <= row < rows_number and 0 <= column < columns_number):
+            continue
+        # Curses raises exception on drawing in a lower right corner of the window
+        if row == rows_number - 1 and column == columns_number - 1:
+            continue
+        canvas.addch(row, column, ' ' if negative else symbol)
+
+
+async def fly_garbage_around(canvas, row, column, frame, speed=0.5, draw=draw_frame):
+    rows_number, _ = canvas.getmaxyx()
+    frame_rows_number, _ = get_frame_size(frame)
+    while True:
+        draw(canvas, row, column, frame)
+        await sleep()
+        draw(canvas, row, column, frame, negative=True)
+        row += speed
+        if row >= rows_number:
+            row = -frame_rows_number
+
+
+def count_calls_per_tic(buffered):
+    rng = random.Random(0)
+    window = CountingWindow(SCREEN_ROWS, SCREEN_COLUMNS)
+    canvas = FrameBuffer(window) if buffered else window
+    scheduler = Scheduler()
+
+    star_field = StarField.generate(rng, SCREEN_ROWS, SCREEN_COLUMNS, amount=STARS_AMOUNT)
+    if buffered:
+        scheduler.spawn(blink_stars(canvas, star_field))
+    else:
+        for row, column, symbol, offset_tics in star_field.stars:
+            scheduler.spawn(blink(canvas, row, column, offset_tics, symbol))
+
+    frames = [load_sprite(f'garbage_frames/{name}') for name in GARBAGE_FRAME_NAMES]
+    for _ in range(GARBAGE_AMOUNT):
+        scheduler.spawn(fly_garbage_around(
+            canvas,
+            rng.uniform(0, SCREEN_ROWS),
+            rng.randint(1, SCREEN_COLUMNS - 20),
+            rng.choice(frames),
+            draw=draw_frame if buffered else draw_frame_by_symbols,
+        ))
+
+    for _ in range(TICS_AMOUNT):
+        scheduler.run_tic()
+        if buffered:
+            canvas.finish_tic()
+            canvas.refresh()
+
+    return window.calls / TICS_AMOUNT
+
+
+def main():
+    direct_calls = count_calls_per_tic(buffered=False)
+    buffered_calls = count_calls_per_tic(buffered=True)
+    print(f'{STARS_AMOUNT} stars, {GARBAGE_AMOUNT} garbage objects, {SCREEN_ROWS}x{SCREEN_COLUMNS} screen')
+    print(f'curses calls per tic, direct drawing: {direct_calls:.0f}')
+    print(f'curses calls per tic, frame buffer:   {buffered_calls:.0f}')
+    print(f'saved: {1 - buffered_calls / direct_calls:.0%}')
+
+
+if __name__ == '__main__':
+    main()
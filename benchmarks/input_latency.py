@@ -0,0 +1,127 @@
+"""Compare input latency of polling the keys once per tic and of reading them on asyncio event loop.
+
+Keys come through a pipe at random moments, latency is the time from
+writing a key to refresh of the frame which used it. There is no garbage
+to crash into, so the game lasts as long as the keys come. Run from the project directory:
+    python3 -m benchmarks.input_latency
+"""
+import asyncio
+import os
+import random
+import statistics
+import threading
+import time
+from collections import deque
+
+import main
+from curses_tools import SPACE_KEY_CODE, read_controls
+from frame_buffer import FrameBuffer
+from game_clock import TicClock
+from headless import FakeCanvas
+from input_events import EventLoopTicClock, InputEvents, run_game_loop
+from scheduler import sleep
+from starfield import StarField, blink_stars
+
+
+SCREEN_ROWS = 50
+SCREEN_COLUMNS = 180
+KEYS_AMOUNT = 100
+MIN_KEY_INTERVAL = 0.05
+MAX_KEY_INTERVAL = 0.3
+
+
+class PipeCanvas(FakeCanvas):
+    """Fake canvas reading keys from a pipe, measuring time till the frame with the key is refreshed."""
+
+    def __init__(self, fd, written_at):
+        super().__init__(SCREEN_ROWS, SCREEN_COLUMNS)
+        self.fd = fd
+        self._written_at = written_at
+        self._read_at = []
+        self.latencies = []
+
+    def getch(self):
+        try:
+            key = os.read(self.fd, 1)
+        except BlockingIOError:
+            return -1
+        self._read_at.append(self._written_at.popleft())
+        return key[0]
+
+    def refresh(self):
+        refreshed_at = time.monotonic()
+        self.latencies.extend(refreshed_at - written_at for written_at in self._read_at)
+        self._read_at.clear()
+
+
+async def count_shots(canvas, controls_reader):
+    shots_fired = 0
+    while True:
+        _, _, space_pressed = controls_reader(canvas)
+        shots_fired += space_pressed
+        canvas.addstr(1, 1, f'Shots: {shots_fired}')
+        await sleep()
+
+
+def press_keys(fd, written_at, seed):
+    rng = random.Random(seed)
+    for _ in range(KEYS_AMOUNT):
+        time.sleep(rng.uniform(MIN_KEY_INTERVAL, MAX_KEY_INTERVAL))
+        written_at.append(time.monotonic())
+        os.write(fd, bytes([SPACE_KEY_CODE]))
+
+
+def measure_latency(polling):
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    written_at = deque()
+    window = PipeCanvas(read_fd, written_at)
+    canvas = FrameBuffer(window)
+
+    input_events = None if polling else InputEvents(read_fd)
+    main.reset_game_state(seed=0)
+    main.scheduler.spawn(blink_stars(canvas, StarField.generate(main.rng, SCREEN_ROWS, SCREEN_COLUMNS)))
+    main.scheduler.spawn(count_shots(canvas, read_controls if polling else input_events))
+    tic_clock = (TicClock if polling else EventLoopTicClock)(
+        main.TIC_TIMEOUT,
+        max_tics_per_render=main.MAX_TICS_PER_RENDER,
+    )
+
+    keyboard = threading.Thread(target=press_keys, args=(write_fd, written_at, 0))
+    keyboard.start()
+    if polling:
+        tic_clock.start()
+        tics = 1
+        while keyboard.is_alive():
+            main.play_tics(canvas, tics)
+            tics = tic_clock.tick()
+    else:
+        async def play_till_keys_end():
+            game_loop = asyncio.create_task(run_game_loop(
+                canvas,
+                lambda tics: main.play_tics(canvas, tics),
+                tic_clock,
+                input_events,
+            ))
+            while keyboard.is_alive():
+                await asyncio.sleep(main.TIC_TIMEOUT)
+            game_loop.cancel()
+
+        asyncio.run(play_till_keys_end())
+    main.scheduler.close()
+    os.close(read_fd)
+    os.close(write_fd)
+    return window.latencies, tic_clock
+
+
+def main_benchmark():
+    for name, polling in (('polling once per tic', True), ('asyncio event loop', False)):
+        latencies, tic_clock = measure_latency(polling)
+        print(
+            f'{name}: latency mean {statistics.mean(latencies) * 1000:.1f} ms, '
+            f'max {max(latencies) * 1000:.1f} ms; {tic_clock.get_report()}'
+        )
+
+
+if __name__ == '__main__':
+    main_benchmark()
@@ -0,0 +1,71 @@
+"""Compare collision lookups through ObstacleGrid with linear scan of obstacles.
+
+Run from the project directory:
+    python3 -m benchmarks.obstacle_grid
+"""
+import random
+import timeit
+
+from obstacles import Obstacle, ObstacleGrid
+
+
+SCREEN_ROWS = 60
+SCREEN_COLUMNS = 200
+QUERIES_AMOUNT = 100
+OBSTACLES_AMOUNTS = (10, 100, 1000)
+
+
+def get_random_obstacles(rng, amount):
+    obstacles = []
+    for _ in range(amount):
+        rows_size, columns_size = rng.randint(3, 8), rng.randint(3, 20)
+        obstacles.append(Obstacle(
+            rng.randint(0, SCREEN_ROWS - rows_size) + rng.choice((0, 0.5)),
+            rng.randint(0, SCREEN_COLUMNS - columns_size),
+            rows_size,
+            columns_size,
+        ))
+    return obstacles
+
+
+def scan_linear(obstacles, points):
+    for row, column in points:
+        [obstacle for obstacle in obstacles if obstacle.has_collision(row, column)]
+
+
+def scan_grid(grid, points):
+    for row, column in points:
+        grid.get_obstacles_in_area(row, column)
+
+
+def main():
+    rng = random.Random(0)
+    points = [
+        (rng.uniform(0, SCREEN_ROWS), rng.randint(0, SCREEN_COLUMNS))
+        for _ in range(QUERIES_AMOUNT)
+    ]
+
+    print(f'{"obstacles":>10} {"linear, us":>12} {"grid, us":>10} {"speedup":>8}')
+    for amount in OBSTACLES_AMOUNTS:
+        obstacles = get_random_obstacles(rng, amount)
+        grid = ObstacleGrid()
+        for obstacle in obstacles:
+            grid.add(obstacle)
+
+        for row, column in points:
+            assert (
+                set(grid.get_obstacles_in_area(row, column))
+                == {obstacle for obstacle in obstacles if obstacle.has_collision(row, column)}
+            )
+
+        linear_time = min(timeit.repeat(lambda: scan_linear(obstacles, points), number=5, repeat=5))
+        grid_time = min(timeit.repeat(lambda: scan_grid(grid, points), number=5, repeat=5))
+
+        # per single point query
+        linear_us = linear_time / 5 / QUERIES_AMOUNT * 1e6
+        grid_us = grid_time / 5 / QUERIES_AMOUNT * 1e6
+        print(f'{amount:>10} {linear_us:>12.2f} {grid_us:>10.2f} {linear_us / grid_us:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Play the game in real time with a crowd of spectators and check the loop keeps its pace.
+
+Spectators work in a separate process, some of them read the stream
+too slowly on purpose. Run from the project directory:
+    python3 -m benchmarks.spectators
+"""
+import asyncio
+import multiprocessing
+import time
+
+import main
+from frame_buffer import FrameBuffer
+from game_clock import TicClock
+from headless import FakeCanvas, get_zigzag_keys
+from spectator_server import DEFAULT_HOST, FrameBroadcaster, SpectatorServer, read_message
+
+
+SCREEN_ROWS = 50
+SCREEN_COLUMNS = 180
+SPECTATORS_AMOUNT = 100
+SLOW_SPECTATORS_AMOUNT = 20
+SLOW_SPECTATOR_DELAY = 1
+RENDERS_AMOUNT = 150
+
+
+async def watch(port, delay, received_messages):
+    reader, writer = await asyncio.open_connection(DEFAULT_HOST, port)
+    try:
+        while True:
+            await read_message(reader)
+            received_messages.append(1)
+            if delay:
+                await asyncio.sleep(delay)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def watch_crowd(port, duration, results):
+    received_messages = []
+    watchers = [
+        asyncio.create_task(watch(port, SLOW_SPECTATOR_DELAY if number < SLOW_SPECTATORS_AMOUNT else 0, received_messages))
+        for number in range(SPECTATORS_AMOUNT)
+    ]
+    await asyncio.sleep(duration)
+    for watcher in watchers:
+        watcher.cancel()
+    results.put(len(received_messages))
+
+
+def run_crowd(port, duration, results):
+    asyncio.run(watch_crowd(port, duration, results))
+
+
+def play(spectator_server=None):
+    """Play RENDERS_AMOUNT renders in real time. Return tic clock and the longest work of a render."""
+
+    main.reset_game_state(seed=0)
+    canvas = FrameBuffer(FakeCanvas(SCREEN_ROWS, SCREEN_COLUMNS, get_zigzag_keys()))
+    if spectator_server is not None:
+        canvas.observers.append(FrameBroadcaster(spectator_server))
+    main.start_game(canvas)
+
+    tic_clock = TicClock(main.TIC_TIMEOUT, max_tics_per_render=main.MAX_TICS_PER_RENDER)
+    max_work_time = 0
+    tics = 1
+    for _ in range(RENDERS_AMOUNT):
+        started_at = time.perf_counter()
+        for _ in range(tics):
+            main.scheduler.run_tic()
+            canvas.finish_tic()
+        canvas.border()
+        canvas.refresh()
+        max_work_time = max(max_work_time, time.perf_counter() - started_at)
+        tics = tic_clock.tick()
+    main.scheduler.close()
+    return tic_clock, max_work_time
+
+
+def main_benchmark():
+    tic_clock, max_work_time = play()
+    print(f'Without spectators: {tic_clock.get_report()}, longest render work: {max_work_time * 1000:.1f} ms')
+
+    spectator_server = SpectatorServer(port=0)
+    spectator_server.start()
+    results = multiprocessing.Queue()
+    duration = RENDERS_AMOUNT * main.TIC_TIMEOUT + 2
+    crowd = multiprocessing.Process(target=run_crowd, args=(spectator_server.port, duration, results))
+    crowd.start()
+    while len(spectator_server.spectators) < SPECTATORS_AMOUNT:
+        time.sleep(0.05)
+
+    tic_clock, max_work_time = play(spectator_server)
+    print(
+        f'{SPECTATORS_AMOUNT} spectators, {SLOW_SPECTATORS_AMOUNT} of them slow: {tic_clock.get_report()}, '
+        f'longest render work: {max_work_time * 1000:.1f} ms'
+    )
+    received_messages = results.get()
+    crowd.join()
+    print(f'Messages received by spectators: {received_messages}')
+
+
+if __name__ == '__main__':
+    main_benchmark()
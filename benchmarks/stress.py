@@ -0,0 +1,287 @@
+"""Find the load the game engine sustains within the tic, and check it for leaks on a long run.
+
+Stress mode starts a game with the usual coroutines on a fake canvas, in
+a scenario without garbage, and raises the load step by step: every step
+throws more garbage and launches more shots per tic, and adds stars.
+Garbage is thrown past the idle rocket, so the game never ends. Steps stop
+at the first one whose mean tic time overruns the tic. Tic time is
+measured without tracemalloc, which slows the game down several times,
+memory is measured by the second pass over the same seeded steps.
+
+Soak mode holds one load step for a long run, watching amounts of
+coroutines, obstacles, shots, particles and traced memory window by window.
+Growth through every window after the first one is reported as a leak.
+Run from the project directory:
+    python3 -m benchmarks.stress
+    python3 -m benchmarks.stress --soak 20000
+"""
+import argparse
+import random
+import statistics
+import tracemalloc
+from time import perf_counter
+
+import main
+from assets import load_sprite
+from curses_tools import get_frame_size
+from frame_buffer import FrameBuffer
+from headless import FakeCanvas
+from starfield import STARS_DENSITY, StarField, blink_stars
+
+
+SCREEN_ROWS = 50
+SCREEN_COLUMNS = 180
+SANDBOX_SCENARIO_PATH = 'scenarios/sandbox.json'
+STEP_TICS = 100
+MAX_STEPS = 100
+# Load added by every step
+GARBAGE_PER_TIC_STEP = 2
+SHOTS_PER_TIC_STEP = 1
+STARS_STEP = 500
+# Garbage is thrown not closer than that to the middle of the screen, where the idle rocket is
+ROCKET_MARGIN = 10
+SOAK_WINDOW_TICS = 1000
+# The first window warms up, growth is judged by the next ones, two of them at least
+MIN_SOAK_WINDOWS = 3
+LEAK_TOP_LINES = 5
+COUNTED_OBJECTS = ('garbage', 'shots', 'particles', 'stars', 'coroutines')
+
+
+class StressGame:
+    """Game with the usual coroutines, loaded with garbage and shots bypassing the scenario."""
+
+    def __init__(self, seed=0):
+        main.reset_game_state(seed, SANDBOX_SCENARIO_PATH)
+        self.rng = random.Random(seed)
+        self.canvas = FrameBuffer(FakeCanvas(SCREEN_ROWS, SCREEN_COLUMNS))
+        # Rocket keeps firing up, not moving
+        main.start_game(self.canvas, controls_reader=lambda canvas: (0, 0, True))
+
+        self.garbage_sizes = [
+            get_frame_size(load_sprite(f'garbage_frames/{name}'))
+            for name in main.scenario.frame_names
+        ]
+        middle_column = SCREEN_COLUMNS // 2
+        self.columns_ranges = (
+            (1, middle_column - ROCKET_MARGIN),
+            (middle_column + ROCKET_MARGIN, SCREEN_COLUMNS - 2),
+        )
+        self.step = 0
+        self.stars_amount = int((SCREEN_ROWS - 2) * (SCREEN_COLUMNS - 2) * STARS_DENSITY)
+
+    def next_step(self):
+        self.step += 1
+        star_field = StarField.generate(self.rng, SCREEN_ROWS, SCREEN_COLUMNS, amount=STARS_STEP)
+        main.scheduler.spawn(blink_stars(self.canvas, star_field, main.governor))
+        self.stars_amount += STARS_STEP
+
+    def play_tic(self):
+        """Throw garbage and launch shots of the current step, simulate and render a tic. Return time it took."""
+
+        started_at = perf_counter()
+        rng = self.rng
+        for _ in range(self.step * GARBAGE_PER_TIC_STEP):
+            frame_id = rng.randrange(len(self.garbage_sizes))
+            rows_size, columns_size = self.garbage_sizes[frame_id]
+            first_column, last_column = rng.choice(self.columns_ranges)
+            main.obstacles.add(
+                row=1,
+                column=rng.randint(first_column, last_column - columns_size),
+                rows_size=rows_size,
+                columns_size=columns_size,
+                speed=rng.uniform(0.1, 0.5),
+                frame_id=frame_id,
+            )
+        for _ in range(self.step * SHOTS_PER_TIC_STEP):
+            main.projectiles.launch(
+                SCREEN_ROWS - 2,
+                rng.randint(1, SCREEN_COLUMNS - 2),
+                rows_speed=-rng.uniform(0.3, 0.8),
+            )
+
+        main.scheduler.run_tic()
+        self.canvas.finish_tic()
+        self.canvas.border()
+        self.canvas.refresh()
+        return perf_counter() - started_at
+
+    def get_counts(self):
+        return {
+            'garbage': len(main.obstacles),
+            # Slots of removed obstacles are reused, their amount should stop growing too
+            'garbage_slots': len(main.obstacles.alive),
+            'shots': len(main.projectiles),
+            'particles': len(main.particles),
+            'stars': self.stars_amount,
+            'coroutines': len(main.scheduler),
+        }
+
+    def close(self):
+        if main.game_over:
+            raise RuntimeError('Rocket crashed, stress results are not valid.')
+        main.scheduler.close()
+
+
+def ramp_load(seed, max_steps, tic_budget=None, trace_memory=False):
+    """Raise the load step by step, stop after the first step with mean tic time over tic_budget.
+
+    Return list of dicts with peak object counts and tic times of every step,
+    and traced memory at the step end if trace_memory is set.
+    """
+
+    if trace_memory:
+        tracemalloc.start()
+    game = StressGame(seed)
+    steps = []
+    try:
+        for _ in range(max_steps):
+            game.next_step()
+            tic_times = []
+            peak_counts = dict.fromkeys(COUNTED_OBJECTS, 0)
+            for _ in range(STEP_TICS):
+                tic_times.append(game.play_tic())
+                counts = game.get_counts()
+                for name in COUNTED_OBJECTS:
+                    peak_counts[name] = max(peak_counts[name], counts[name])
+
+            step = {
+                'step': game.step,
+                **peak_counts,
+                'tic_mean': statistics.mean(tic_times),
+                'tic_max': max(tic_times),
+            }
+            if trace_memory:
+                step['memory'], _ = tracemalloc.get_traced_memory()
+            steps.append(step)
+            if tic_budget is not None and step['tic_mean'] > tic_budget:
+                break
+    finally:
+        game.close()
+        if trace_memory:
+            tracemalloc.stop()
+    return steps
+
+
+def soak(seed, tics, load_step):
+    """Hold the load step for given amount of tics. Return counts by window and tracemalloc snapshots.
+
+    Tics are rounded to whole windows, MIN_SOAK_WINDOWS of them at least.
+    The first snapshot is taken after the first window, when the game has warmed up.
+    """
+
+    tracemalloc.start()
+    game = StressGame(seed)
+    for _ in range(load_step):
+        game.next_step()
+
+    windows = []
+    warm_snapshot = None
+    try:
+        for _ in range(max(tics // SOAK_WINDOW_TICS, MIN_SOAK_WINDOWS)):
+            for _ in range(SOAK_WINDOW_TICS):
+                game.play_tic()
+            memory, _ = tracemalloc.get_traced_memory()
+            windows.append({**game.get_counts(), 'memory': memory})
+            if warm_snapshot is None:
+                warm_snapshot = tracemalloc.take_snapshot()
+        last_snapshot = tracemalloc.take_snapshot()
+    finally:
+        game.close()
+        tracemalloc.stop()
+    return windows, warm_snapshot, last_snapshot
+
+
+def find_growing(windows):
+    """Return names of measures growing through every window after the first one."""
+
+    warm_windows = windows[1:]
+    return [
+        name for name in warm_windows[0]
+        if all(
+            previous[name] < current[name]
+            for previous, current in zip(warm_windows, warm_windows[1:])
+        )
+    ]
+
+
+def format_memory(memory):
+    return '-' if memory is None else f'{memory / 2 ** 20:.1f} MB'
+
+
+def print_stress(steps, tic_budget):
+    print(
+        f'{"step":>4} {"garbage":>8} {"shots":>6} {"particles":>9} {"stars":>6} {"coroutines":>10} '
+        f'{"tic mean":>9} {"tic max":>9} {"memory":>8}'
+    )
+    for step in steps:
+        print(
+            f'{step["step"]:>4} {step["garbage"]:>8} {step["shots"]:>6} {step["particles"]:>9} '
+            f'{step["stars"]:>6} {step["coroutines"]:>10} {step["tic_mean"] * 1000:>6.1f} ms '
+            f'{step["tic_max"] * 1000:>6.1f} ms {format_memory(step.get("memory")):>8}'
+        )
+
+    if steps[-1]['tic_mean'] <= tic_budget:
+        print(f'Not saturated in {len(steps)} steps.')
+        return
+    print(
+        f'Saturated at step {steps[-1]["step"]}: mean tic {steps[-1]["tic_mean"] * 1000:.1f} ms '
+        f'of {tic_budget * 1000:.0f} ms budget.'
+    )
+    if len(steps) > 1:
+        sustained = steps[-2]
+        counts = ', '.join(f'{name} {sustained[name]}' for name in COUNTED_OBJECTS)
+        print(f'Max sustainable: {counts}, memory {format_memory(sustained.get("memory"))}.')
+
+
+def print_soak(windows, warm_snapshot, last_snapshot):
+    names = list(windows[0])
+    print(f'{"window":>6} ' + ' '.join(f'{name:>13}' for name in names))
+    for number, window in enumerate(windows, start=1):
+        print(f'{number:>6} ' + ' '.join(f'{window[name]:>13}' for name in names))
+
+    if len(windows) < MIN_SOAK_WINDOWS:
+        print(f'Not enough windows to judge leaks, {MIN_SOAK_WINDOWS} windows of {SOAK_WINDOW_TICS} tics are needed.')
+        return
+    growing = find_growing(windows)
+    if not growing:
+        print(f'No leaks: nothing grows through {len(windows) - 1} windows of {SOAK_WINDOW_TICS} tics.')
+        return
+    print(f'Leak suspected, growing through every window: {", ".join(growing)}. Lines allocating most since warm up:')
+    own_traces = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    memory_changes = last_snapshot.filter_traces(own_traces).compare_to(
+        warm_snapshot.filter_traces(own_traces),
+        'lineno',
+    )
+    for memory_change in memory_changes[:LEAK_TOP_LINES]:
+        print(f'  {memory_change}')
+
+
+def main_stress():
+    parser = argparse.ArgumentParser(description='Find the load the game sustains, or soak it to find leaks.')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the game and the load')
+    parser.add_argument('--max-steps', type=int, default=MAX_STEPS, help='stop raising the load after that')
+    parser.add_argument('--budget', type=float, default=1.0, help='part of the tic the mean tic time may take')
+    parser.add_argument('--skip-memory', action='store_true', help='don\'t repeat the steps to measure memory')
+    parser.add_argument(
+        '--soak',
+        type=int,
+        metavar='TICS',
+        help=f'hold one load step for that many tics instead, {MIN_SOAK_WINDOWS * SOAK_WINDOW_TICS} at least',
+    )
+    parser.add_argument('--soak-step', type=int, default=1, help='load step to hold while soaking')
+    args = parser.parse_args()
+
+    if args.soak:
+        print_soak(*soak(args.seed, args.soak, args.soak_step))
+        return
+
+    tic_budget = main.TIC_TIMEOUT * args.budget
+    steps = ramp_load(args.seed, args.max_steps, tic_budget)
+    if not args.skip_memory:
+        for step, memory_step in zip(steps, ramp_load(args.seed, len(steps), trace_memory=True)):
+            step['memory'] = memory_step['memory']
+    print_stress(steps, tic_budget)
+
+
+if __name__ == '__main__':
+    main_stress()
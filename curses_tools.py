@@ -1,3 +1,7 @@
+import curses
+from functools import lru_cache
+
+
 SPACE_KEY_CODE = 32
 LEFT_KEY_CODE = 260
 RIGHT_KEY_CODE = 261
@@ -5,41 +9,96 @@ UP_KEY_CODE = 259
 DOWN_KEY_CODE = 258
 
 
+class Sprite:
+    """Multiline text fragment, prepared once to be drawn many times.
+
+    Sprite keeps its size and horizontal runs of non-space symbols,
+    so drawing it takes one addstr call per run.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        lines = text.splitlines()
+        self.rows_number = len(lines)
+        self.columns_number = max([len(line) for line in lines])
+
+        self.cells = []
+        self.runs = []
+        for row, line in enumerate(lines):
+            run_start = None
+            for column, symbol in enumerate(line + ' '):
+                if symbol != ' ':
+                    self.cells.append((row, column, symbol))
+                    if run_start is None:
+                        run_start = column
+                elif run_start is not None:
+                    run = line[run_start:column]
+                    self.runs.append((row, run_start, run, ' ' * len(run)))
+                    run_start = None
+
+    def __repr__(self):
+        return f'Sprite({self.rows_number}x{self.columns_number})'
+
+
+@lru_cache(maxsize=256)
+def get_sprite(text):
+    """Return sprite for multiline text fragment, caching recently used ones."""
+
+    return Sprite(text)
+
+
 def draw_frame(canvas, start_row, start_column, text, negative=False):
-    """Draw multiline text fragment on canvas, erase text instead of drawing if negative=True is specified."""
+    """Draw multiline text fragment or sprite on canvas, erase it instead of drawing if negative=True is specified."""
 
-    rows_number, columns_number = canvas.getmaxyx()
+    sprite = get_sprite(text) if isinstance(text, str) else text
 
-    for row, line in enumerate(text.splitlines(), round(start_row)):
+    rows_number, columns_number = canvas.getmaxyx()
+    start_row, start_column = round(start_row), round(start_column)
+    run_index = 3 if negative else 2
+
+    end_row = start_row + sprite.rows_number
+    end_column = start_column + sprite.columns_number
+    fits_canvas = (
+        start_row >= 0 and start_column >= 0
+        and end_row <= rows_number and end_column <= columns_number
+        # Curses will raise exception on drawing in a lower right corner
+        # of the window. Don`t ask why…
+        # https://docs.python.org/3/library/curses.html#curses.window.addch
+        and (end_row < rows_number or end_column < columns_number)
+    )
+    if fits_canvas:
+        for run in sprite.runs:
+            canvas.addstr(start_row + run[0], start_column + run[1], run[run_index])
+        return
+
+    for run in sprite.runs:
+        row = start_row + run[0]
         if row < 0:
             continue
-
         if row >= rows_number:
             break
 
-        for column, symbol in enumerate(line, round(start_column)):
-            if column < 0:
-                continue
-
-            if column >= columns_number:
-                break
+        symbols = run[run_index]
+        column = start_column + run[1]
+        if column < 0:
+            symbols = symbols[-column:]
+            column = 0
 
-            if symbol == ' ':
-                continue
+        max_length = columns_number - column
+        if row == rows_number - 1:
+            max_length -= 1
+        if len(symbols) > max_length:
+            symbols = symbols[:max(max_length, 0)]
 
-            # Check that current position is not in a lower right corner
-            # of the window.
-            # Curses will raise exception in that case. Don`t ask why…
-            # https://docs.python.org/3/library/curses.html#curses.window.addch
-            if row == rows_number - 1 and column == columns_number - 1:
-                continue
-
-            symbol = symbol if not negative else ' '
-            canvas.addch(row, column, symbol)
+        if symbols:
+            canvas.addstr(row, column, symbols)
 
 
 def get_frame_size(text):
-    """Calculate size of multiline text fragment, return pair — number of rows and columns."""
+    """Calculate size of multiline text fragment or sprite, return pair — number of rows and columns."""
+
+    if isinstance(text, Sprite):
+        return text.rows_number, text.columns_number
 
     lines = text.splitlines()
     rows = len(lines)
@@ -47,18 +106,22 @@ def get_frame_size(text):
     return rows, columns
 
 
-def read_controls(canvas):
-    """Read keys pressed and returns tuple with controls state."""
+def beep():
+    """Ring terminal bell, do nothing if curses screen is not initialized."""
+
+    try:
+        curses.beep()
+    except curses.error:
+        pass
+
+
+def get_controls(key_codes):
+    """Turn codes of pressed keys into tuple with controls state."""
 
     rows_direction = columns_direction = 0
     space_pressed = False
 
-    while True:
-        pressed_key_code = canvas.getch()
-
-        if pressed_key_code == -1:
-            # https://docs.python.org/3/library/curses.html#curses.window.getch
-            break
+    for pressed_key_code in key_codes:
 
         if pressed_key_code == UP_KEY_CODE:
             rows_direction = -1
@@ -76,3 +139,10 @@ def read_controls(canvas):
             space_pressed = True
 
     return rows_direction, columns_direction, space_pressed
+
+
+def read_controls(canvas):
+    """Read keys pressed and returns tuple with controls state."""
+
+    # https://docs.python.org/3/library/curses.html#curses.window.getch
+    return get_controls(iter(canvas.getch, -1))
@@ -1,45 +1,28 @@
 import asyncio
-import curses
-from curses_tools import draw_frame, get_frame_size
 
-EXPLOSION_FRAMES = [
-    """\
-           (_)
-       (  (   (  (
-      () (  (  )
-        ( )  ()
-    """,
-    """\
-           (_)
-       (  (   (
-         (  (  )
-          )  (
-    """,
-    """\
-            (
-          (   (
-         (     (
-          )  (
-    """,
-    """\
-            (
-              (
-            (
+from curses_tools import beep
+from particles import BURST_SIZE, ParticleSystem
 
-    """,
-]
 
+async def explode(canvas, center_row, center_column, governor=None, particles=None):
+    """Emit a burst of particles to the particle system animated by the game.
 
-async def explode(canvas, center_row, center_column):
-    rows, columns = get_frame_size(EXPLOSION_FRAMES[0])
-    corner_row = center_row - rows / 2
-    corner_column = center_column - columns / 2
+    Without a particle system the explosion gets its own one and animates it till the last particle dies.
+    """
 
-    curses.beep()
-    for frame in EXPLOSION_FRAMES:
+    beep()
+    burst_size = BURST_SIZE
+    if governor is not None:
+        burst_size //= governor.particles_step
 
-        draw_frame(canvas, corner_row, corner_column, frame)
+    if particles is not None:
+        particles.emit_burst(center_row, center_column, burst_size)
+        return
 
-        await asyncio.sleep(0)
-        draw_frame(canvas, corner_row, corner_column, frame, negative=True)
+    particles = ParticleSystem(capacity=burst_size)
+    particles.emit_burst(center_row, center_column, burst_size)
+    while True:
+        particles.update(canvas)
+        if not particles:
+            return
         await asyncio.sleep(0)
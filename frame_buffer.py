@@ -0,0 +1,224 @@
+import curses
+from array import array
+
+
+BLANK = ord(' ')
+
+
+class BufferWindow:
+    """Rectangular area of a frame buffer, mimicking drawing methods of curses window."""
+
+    def __init__(self, frame_buffer, begin_row, begin_column, rows_number, columns_number):
+        self.frame_buffer = frame_buffer
+        self.begin_row = begin_row
+        self.begin_column = begin_column
+        self.rows_number = rows_number
+        self.columns_number = columns_number
+
+    def getmaxyx(self):
+        return self.rows_number, self.columns_number
+
+    def getch(self):
+        return self.frame_buffer.window.getch()
+
+    def derwin(self, rows_number, columns_number, begin_row, begin_column):
+        return BufferWindow(
+            self.frame_buffer,
+            self.begin_row + begin_row,
+            self.begin_column + begin_column,
+            rows_number,
+            columns_number,
+        )
+
+    def addch(self, row, column, symbol, attributes=0):
+        if isinstance(symbol, int):
+            attributes |= symbol & curses.A_ATTRIBUTES
+            symbol = symbol & curses.A_CHARTEXT
+        else:
+            symbol = ord(symbol)
+
+        if 0 <= row < self.rows_number and 0 <= column < self.columns_number:
+            self.frame_buffer.put(self.begin_row + row, self.begin_column + column, symbol, attributes)
+
+    def addstr(self, row, column, text, attributes=0):
+        if not 0 <= row < self.rows_number:
+            return
+
+        row += self.begin_row
+        put = self.frame_buffer.put
+        for column, symbol in enumerate(text, column):
+            if column < 0:
+                continue
+            if column >= self.columns_number:
+                break
+            put(row, self.begin_column + column, ord(symbol), attributes)
+
+    def border(self):
+        # ACS_* constants appear in curses module only after initscr() call
+        vertical_line = getattr(curses, 'ACS_VLINE', ord('|'))
+        horizontal_line = getattr(curses, 'ACS_HLINE', ord('-'))
+        max_row, max_column = self.rows_number - 1, self.columns_number - 1
+
+        for column in range(1, max_column):
+            self.addch(0, column, horizontal_line)
+            self.addch(max_row, column, horizontal_line)
+        for row in range(1, max_row):
+            self.addch(row, 0, vertical_line)
+            self.addch(row, max_column, vertical_line)
+
+        self.addch(0, 0, getattr(curses, 'ACS_ULCORNER', ord('+')))
+        self.addch(0, max_column, getattr(curses, 'ACS_URCORNER', ord('+')))
+        self.addch(max_row, 0, getattr(curses, 'ACS_LLCORNER', ord('+')))
+        self.addch(max_row, max_column, getattr(curses, 'ACS_LRCORNER', ord('+')))
+
+
+class FrameBuffer(BufferWindow):
+    """Back buffer placed in front of curses window.
+
+    Coroutines draw into the buffer as into a usual window. refresh() compares
+    the buffer with the frame already shown and sends only changed cells to
+    curses, joining neighbour cells of the same attributes into one addstr call.
+
+    Within a tic blank symbol never erases a symbol drawn in the same tic, so
+    sprite erasing its previous position can't wipe out a sprite drawn over it.
+    Call finish_tic() after every simulated tic to start a new one.
+
+    Blank symbol uncovers the background layer, which is changed with
+    put_background(), so erased sprites don't leave holes in the star field.
+    """
+
+    def __init__(self, window):
+        rows_number, columns_number = window.getmaxyx()
+        super().__init__(self, 0, 0, rows_number, columns_number)
+        self.window = window
+
+        cells_number = rows_number * columns_number
+        self._symbols = array('L', [BLANK]) * cells_number
+        self._attributes = array('L', [0]) * cells_number
+        self._shown_symbols = array('L', [BLANK]) * cells_number
+        self._shown_attributes = array('L', [0]) * cells_number
+        self._background_symbols = array('L', [BLANK]) * cells_number
+        self._background_attributes = array('L', [0]) * cells_number
+        self._drawn_in_tic = bytearray(cells_number)
+        self._drawn_cells = []
+        self._dirty_cells = set()
+
+        self.last_refresh_writes = 0
+        # Callables getting the frame buffer and runs sent to the screen on every refresh
+        self.observers = []
+
+    def put(self, row, column, symbol, attributes=0):
+        cell = row * self.columns_number + column
+
+        if symbol == BLANK:
+            if self._drawn_in_tic[cell]:
+                return
+            symbol = self._background_symbols[cell]
+            attributes = self._background_attributes[cell]
+        elif not self._drawn_in_tic[cell]:
+            self._drawn_in_tic[cell] = 1
+            self._drawn_cells.append(cell)
+
+        self._symbols[cell] = symbol
+        self._attributes[cell] = attributes
+        self._dirty_cells.add(cell)
+
+    def put_background(self, row, column, symbol, attributes=0):
+        """Change background cell, showing it if the cell is not covered now."""
+
+        cell = row * self.columns_number + column
+        background_shown = (
+            self._symbols[cell] == self._background_symbols[cell]
+            and self._attributes[cell] == self._background_attributes[cell]
+        )
+        self._background_symbols[cell] = symbol
+        self._background_attributes[cell] = attributes
+        if background_shown:
+            self._symbols[cell] = symbol
+            self._attributes[cell] = attributes
+            self._dirty_cells.add(cell)
+
+    def finish_tic(self):
+        drawn_in_tic = self._drawn_in_tic
+        for cell in self._drawn_cells:
+            drawn_in_tic[cell] = 0
+        self._drawn_cells.clear()
+
+    def _get_changed_runs(self):
+        """Yield (row, column, text, attributes) for rows of changed cells."""
+
+        symbols, attributes = self._symbols, self._attributes
+        shown_symbols, shown_attributes = self._shown_symbols, self._shown_attributes
+        columns_number = self.columns_number
+
+        run_start = run_end = None
+        run_attributes = 0
+        for cell in sorted(self._dirty_cells):
+            symbol, cell_attributes = symbols[cell], attributes[cell]
+            if symbol == shown_symbols[cell] and cell_attributes == shown_attributes[cell]:
+                continue
+            shown_symbols[cell] = symbol
+            shown_attributes[cell] = cell_attributes
+
+            continues_run = (
+                cell == run_end
+                and cell_attributes == run_attributes
+                and cell % columns_number
+            )
+            if not continues_run:
+                if run_start is not None:
+                    yield (
+                        *divmod(run_start, columns_number),
+                        ''.join(map(chr, symbols[run_start:run_end])),
+                        run_attributes,
+                    )
+                run_start, run_attributes = cell, cell_attributes
+            run_end = cell + 1
+
+        if run_start is not None:
+            yield (
+                *divmod(run_start, columns_number),
+                ''.join(map(chr, symbols[run_start:run_end])),
+                run_attributes,
+            )
+
+        self._dirty_cells.clear()
+
+    def get_shown_runs(self):
+        """Return (row, column, text, attributes) runs covering the whole shown frame."""
+
+        symbols, attributes = self._shown_symbols, self._shown_attributes
+        runs = []
+        for row in range(self.rows_number):
+            first_cell = row * self.columns_number
+            end_cell = first_cell + self.columns_number
+            run_start = first_cell
+            for cell in range(first_cell + 1, end_cell + 1):
+                if cell == end_cell or attributes[cell] != attributes[run_start]:
+                    runs.append((
+                        row,
+                        run_start - first_cell,
+                        ''.join(map(chr, symbols[run_start:cell])),
+                        attributes[run_start],
+                    ))
+                    run_start = cell
+        return runs
+
+    def refresh(self):
+        last_row, last_column = self.rows_number - 1, self.columns_number - 1
+        runs = list(self._get_changed_runs())
+
+        for row, column, text, attributes in runs:
+            try:
+                self.window.addstr(row, column, text, attributes)
+            except curses.error:
+                # Curses writes the symbol to the lower right corner of the
+                # window, but raises exception since cursor can't move further
+                if row != last_row or column + len(text) - 1 != last_column:
+                    raise
+
+        for observer in self.observers:
+            observer(self, runs)
+
+        self.last_refresh_writes = len(runs)
+        self.window.refresh()
@@ -0,0 +1,63 @@
+import time
+
+
+class TicClock:
+    """Pace game loop with fixed length tics, counting time by deadlines of monotonic clock.
+
+    Time spent on the work of a tic is taken out of its budget, so the loop
+    sleeps only for the rest of it. If the loop falls behind, tick() asks to
+    simulate up to max_tics_per_render tics before the next render to catch up.
+    """
+
+    def __init__(self, tic_timeout, max_tics_per_render=1, clock=time.monotonic, sleep=time.sleep):
+        self.tic_timeout = tic_timeout
+        self.max_tics_per_render = max_tics_per_render
+        self._clock = clock
+        self._sleep = sleep
+        self.start()
+
+    def start(self):
+        self.started_at = self._clock()
+        self.deadline = self.started_at + self.tic_timeout
+        self.tics = 0
+        self.renders = 0
+        self.overruns = 0
+
+    def tick(self):
+        """Wait for the next tic deadline. Return number of tics to simulate before next render."""
+
+        self.renders += 1
+        now = self._clock()
+
+        if now < self.deadline:
+            self._sleep(self.deadline - now)
+            tics = 1
+        else:
+            self.overruns += 1
+            late_tics = int((now - self.deadline) // self.tic_timeout) + 1
+            tics = min(late_tics, self.max_tics_per_render)
+
+        self.deadline += tics * self.tic_timeout
+        if self.deadline <= now:
+            # Lag is too big to catch up, drop it instead of rushing later
+            self.deadline = now + self.tic_timeout
+
+        self.tics += tics
+        return tics
+
+    @property
+    def elapsed(self):
+        return self._clock() - self.started_at
+
+    @property
+    def tic_rate(self):
+        """Real amount of simulated tics per second."""
+
+        elapsed = self.elapsed
+        return self.tics / elapsed if elapsed else 0.0
+
+    def get_report(self):
+        return (
+            f'Tic rate: {self.tic_rate:.2f} of {1 / self.tic_timeout:.2f} tics per second, '
+            f'renders: {self.renders}, overruns: {self.overruns}'
+        )
@@ -1,27 +1,113 @@
-PHRASES = {
-    # Только на английском, Repl.it ломается на кириллице
-    1957: "First Sputnik",
-    1961: "Gagarin flew!",
-    1969: "Armstrong got on the moon!",
-    1971: "First orbital space station Salute-1",
-    1981: "Flight of the Shuttle Columbia",
-    1998: 'ISS start building',
-    2011: 'Messenger launch to Mercury',
-    2020: "Take the plasma gun! Shoot the garbage!",
-}
-
-def get_garbage_delay_tics(year):
-    if year < 1961:
-        return None
-    elif year < 1969:
-        return 20
-    elif year < 1981:
-        return 14
-    elif year < 1995:
-        return 10
-    elif year < 2010:
-        return 8
-    elif year < 2020:
-        return 6
-    else:
-        return 2
+"""Scenario of the game: when and what garbage flies to the orbit, and phrases shown year by year.
+
+Scenario is a JSON file with start year, amount of tics per year, weights
+of garbage frames by their names, list of eras and phrases by year. Era
+starts from_year and lasts till the next one, it sets garbage_delay_tics
+between garbage throws (null for no garbage), garbage_speed and may
+override garbage_frames weights. Phrases are in English only, Repl.it
+breaks on Cyrillic.
+
+Scenario is compiled into a spawn timeline before the game starts, the
+game just consumes spawns from it tic by tic.
+"""
+import json
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+
+DEFAULT_SCENARIO_PATH = 'scenarios/classic.json'
+DEFAULT_GARBAGE_SPEED = 0.5
+
+
+class Scenario:
+    """Scenario loaded from a data file, with eras looked up by year."""
+
+    def __init__(self, start_year, year_tics, garbage_frames, eras, phrases):
+        if not eras:
+            raise ValueError('Scenario should have at least one era.')
+        eras = sorted(eras, key=lambda era: era['from_year'])
+        if eras[0]['from_year'] > start_year:
+            raise ValueError(f'The first era should start not later than start year {start_year}.')
+
+        self.start_year = start_year
+        self.year_tics = year_tics
+        self.garbage_frames = garbage_frames
+        self.frame_names = list(garbage_frames)
+        self.eras = eras
+        self.phrases = phrases
+        self._eras_from_years = [era['from_year'] for era in eras]
+
+    @classmethod
+    def load(cls, path=DEFAULT_SCENARIO_PATH):
+        with open(path, 'r') as scenario_file:
+            scenario = json.load(scenario_file)
+        return cls(
+            scenario['start_year'],
+            scenario['year_tics'],
+            scenario['garbage_frames'],
+            scenario['eras'],
+            {int(year): phrase for year, phrase in scenario.get('phrases', {}).items()},
+        )
+
+    def get_era(self, year):
+        return self.eras[max(bisect_right(self._eras_from_years, year) - 1, 0)]
+
+    def get_garbage_delay_tics(self, year):
+        return self.get_era(year).get('garbage_delay_tics')
+
+    def get_phrase(self, year):
+        return self.phrases.get(year)
+
+
+class SpawnTimeline:
+    """Garbage throws of a scenario, generated lazily as (tic, frame_id, column, speed) tuples.
+
+    Eras are compiled once: start tics, cumulative frame weights and
+    columns where every frame fits into the world. Iteration is seeded,
+    so every pass over the timeline gives the same spawns. Frame ids are
+    indexes in scenario.frame_names.
+    """
+
+    def __init__(self, scenario, frames_columns_sizes, max_column_within_borders, world_screens=1, seed=None):
+        if world_screens < 1:
+            raise ValueError(f'Wrong world_screens value {world_screens}. Expects 1 or more.')
+
+        self.scenario = scenario
+        self.world_screens = world_screens
+        self.seed = seed
+        self.max_columns = [
+            max_column_within_borders - columns_size
+            for columns_size in frames_columns_sizes
+        ]
+        self._eras_start_tics = []
+        self._eras = []
+        for era in scenario.eras:
+            weights = era.get('garbage_frames', scenario.garbage_frames)
+            self._eras_start_tics.append(max((era['from_year'] - scenario.start_year) * scenario.year_tics, 0))
+            self._eras.append((
+                era.get('garbage_delay_tics'),
+                era.get('garbage_speed', DEFAULT_GARBAGE_SPEED),
+                list(accumulate(weights.get(name, 0) for name in scenario.frame_names)),
+            ))
+
+    def __iter__(self):
+        rng = random.Random(self.seed)
+        max_columns = self.max_columns
+        eras_start_tics = self._eras_start_tics
+        last_frame_id = len(max_columns) - 1
+        tic = 0
+        while True:
+            era_index = bisect_right(eras_start_tics, tic) - 1
+            garbage_delay_tics, speed, cumulative_weights = self._eras[era_index]
+            if not garbage_delay_tics:
+                if era_index + 1 == len(eras_start_tics):
+                    return
+                tic = eras_start_tics[era_index + 1]
+                continue
+
+            total_weight = cumulative_weights[-1]
+            for _ in range(self.world_screens):
+                frame_id = bisect_right(cumulative_weights, rng.random() * total_weight, 0, last_frame_id)
+                yield tic, frame_id, rng.randint(1, max_columns[frame_id]), speed
+            tic += garbage_delay_tics
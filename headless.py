@@ -0,0 +1,219 @@
+"""Run the game without terminal and tic sleeps, as fast as CPU allows.
+
+Usage:
+    python3 headless.py --tics 3000 --pilot zigzag
+"""
+import argparse
+import curses
+import random
+import sys
+import time
+from collections import deque
+from itertools import cycle, repeat
+
+import main
+from curses_tools import DOWN_KEY_CODE, LEFT_KEY_CODE, RIGHT_KEY_CODE, SPACE_KEY_CODE, UP_KEY_CODE, read_controls
+from frame_buffer import FrameBuffer
+from game_scenario import DEFAULT_SCENARIO_PATH
+from profiler import TicProfiler
+from replay import ControlsRecorder, ControlsReplayer, load_input_log, save_input_log
+
+
+class FakeCanvas:
+    """In-memory stand-in for curses window.
+
+    Keys are taken from an iterable of per-tic key code sequences,
+    every refresh() call moves input to the next tic.
+    """
+
+    def __init__(self, rows_number=50, columns_number=180, keys=(), _cells=None, _offset=(0, 0)):
+        self.rows_number = rows_number
+        self.columns_number = columns_number
+        self.begin_row, self.begin_column = _offset
+        if _cells is None:
+            _cells = [[' '] * columns_number for _ in range(rows_number)]
+        self.cells = _cells
+        self._keys = iter(keys)
+        self._pending_keys = deque()
+        self.refreshes = 0
+
+    def getmaxyx(self):
+        return self.rows_number, self.columns_number
+
+    def derwin(self, rows_number, columns_number, begin_row, begin_column):
+        return FakeCanvas(
+            rows_number,
+            columns_number,
+            _cells=self.cells,
+            _offset=(self.begin_row + begin_row, self.begin_column + begin_column),
+        )
+
+    def addch(self, row, column, symbol, attributes=0):
+        if not (0 <= row < self.rows_number and 0 <= column < self.columns_number):
+            raise curses.error('addch() returned ERR')
+        if isinstance(symbol, int):
+            symbol = chr(symbol & curses.A_CHARTEXT)
+        self.cells[self.begin_row + row][self.begin_column + column] = symbol
+        if row == self.rows_number - 1 and column == self.columns_number - 1:
+            raise curses.error('addch() returned ERR')
+
+    def addstr(self, row, column, text, attributes=0):
+        for column, symbol in enumerate(text, column):
+            self.addch(row, column, symbol, attributes)
+
+    def border(self):
+        max_row, max_column = self.rows_number - 1, self.columns_number - 1
+        for column in range(max_column + 1):
+            symbol = '+' if column in (0, max_column) else '-'
+            self.cells[self.begin_row][self.begin_column + column] = symbol
+            self.cells[self.begin_row + max_row][self.begin_column + column] = symbol
+        for row in range(1, max_row):
+            self.cells[self.begin_row + row][self.begin_column] = '|'
+            self.cells[self.begin_row + row][self.begin_column + max_column] = '|'
+
+    def getch(self):
+        if self._pending_keys:
+            return self._pending_keys.popleft()
+        return -1
+
+    def nodelay(self, flag):
+        pass
+
+    def refresh(self):
+        self.refreshes += 1
+        self._pending_keys.extend(next(self._keys, ()))
+
+    def dump(self):
+        return '\n'.join(''.join(row) for row in self.cells)
+
+
+def get_zigzag_keys(turn_tics=30):
+    """Fire every tic, flying left and right in turn."""
+
+    for key_code in cycle((LEFT_KEY_CODE, RIGHT_KEY_CODE)):
+        yield from repeat((key_code, SPACE_KEY_CODE), turn_tics)
+
+
+def get_random_keys(rng, min_hold_tics=5, max_hold_tics=40):
+    """Hold random arrow keys for random amount of tics, firing most of the time."""
+
+    while True:
+        rows_key_code = rng.choice((UP_KEY_CODE, DOWN_KEY_CODE, None))
+        columns_key_code = rng.choice((LEFT_KEY_CODE, RIGHT_KEY_CODE, None))
+        firing = rng.random() < 0.8
+        key_codes = tuple(
+            key_code for key_code in (rows_key_code, columns_key_code, firing and SPACE_KEY_CODE)
+            if key_code
+        )
+        yield from repeat(key_codes, rng.randint(min_hold_tics, max_hold_tics))
+
+
+PILOTS = {
+    'idle': lambda rng: (),
+    'zigzag': lambda rng: get_zigzag_keys(),
+    'random': get_random_keys,
+}
+
+
+def run_headless(tics, rows_number=50, columns_number=180, keys=(), seed=None, until_game_over=False,
+                 controls_reader=read_controls, profiler=None, world_screens=1, scenario_path=DEFAULT_SCENARIO_PATH):
+    """Play the game on a fake canvas for given amount of tics. Return dict with run stats."""
+
+    main.reset_game_state(seed, scenario_path)
+    window = FakeCanvas(rows_number, columns_number, keys)
+    canvas = FrameBuffer(window)
+    main.start_game(canvas, controls_reader, world_screens)
+    main.scheduler.profiler = profiler
+
+    started_at = time.perf_counter()
+    tics_done = 0
+    while tics_done < tics:
+        if profiler is not None:
+            profiler.start_tic()
+        main.scheduler.run_tic()
+        canvas.finish_tic()
+        canvas.border()
+        canvas.refresh()
+        if profiler is not None:
+            profiler.finish_tic()
+        tics_done += 1
+        if until_game_over and main.game_over:
+            break
+    elapsed = time.perf_counter() - started_at
+    main.scheduler.close()
+
+    return {
+        'tics': tics_done,
+        'elapsed': elapsed,
+        'tics_per_second': tics_done / elapsed if elapsed else 0.0,
+        'year': main.current_year,
+        'game_over': main.game_over,
+        **main.game_stats,
+        'canvas': window,
+    }
+
+
+def main_headless():
+    parser = argparse.ArgumentParser(description='Run the game without terminal as fast as possible.')
+    parser.add_argument('--tics', type=int, default=3000, help='amount of tics to simulate')
+    parser.add_argument('--rows', type=int, default=50, help='fake terminal height')
+    parser.add_argument('--columns', type=int, default=180, help='fake terminal width')
+    parser.add_argument('--world-screens', type=main.positive_int, default=1, help='world width in screens')
+    parser.add_argument('--scenario', default=DEFAULT_SCENARIO_PATH, metavar='PATH', help='scenario JSON file')
+    parser.add_argument('--pilot', choices=PILOTS, default='zigzag', help='scripted input')
+    parser.add_argument('--seed', type=int, help='random seed')
+    parser.add_argument('--until-game-over', action='store_true', help='stop when the rocket crashes')
+    parser.add_argument('--show', action='store_true', help='print the last frame')
+    parser.add_argument('--record', metavar='PATH', help='save input log of the run')
+    parser.add_argument('--replay', metavar='PATH', help='replay input log instead of the pilot')
+    parser.add_argument('--profile', metavar='PATH', help='save time spent per coroutine type to JSON or CSV file')
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    rows_number, columns_number = args.rows, args.columns
+    world_screens = args.world_screens
+    scenario_path = args.scenario
+    controls_reader = read_controls
+    if args.replay:
+        try:
+            input_log_header, controls_log = load_input_log(args.replay)
+        except ValueError as error:
+            sys.exit(f'Can\'t replay {args.replay}: {error}')
+        seed = input_log_header['seed']
+        rows_number, columns_number = input_log_header['rows'], input_log_header['columns']
+        world_screens = input_log_header.get('world_screens', 1)
+        scenario_path = input_log_header.get('scenario', DEFAULT_SCENARIO_PATH)
+        controls_reader = ControlsReplayer(controls_log)
+    elif args.record:
+        controls_reader = ControlsRecorder()
+
+    profiler = TicProfiler(main.TIC_TIMEOUT) if args.profile else None
+
+    stats = run_headless(
+        args.tics,
+        rows_number,
+        columns_number,
+        keys=() if args.replay else PILOTS[args.pilot](random.Random(f'pilot-{seed}')),
+        seed=seed,
+        until_game_over=args.until_game_over,
+        controls_reader=controls_reader,
+        profiler=profiler,
+        world_screens=world_screens,
+        scenario_path=scenario_path,
+    )
+    if args.record:
+        save_input_log(args.record, seed, rows_number, columns_number, controls_reader.controls_log, world_screens,
+                       scenario_path)
+    if profiler is not None:
+        profiler.dump(args.profile)
+    if args.show:
+        print(stats['canvas'].dump())
+    print(
+        f'{stats["tics"]} tics in {stats["elapsed"]:.2f} s, '
+        f'{stats["tics_per_second"]:.0f} tics per second, '
+        f'year {stats["year"]}, game over: {stats["game_over"]}'
+    )
+
+
+if __name__ == '__main__':
+    main_headless()
@@ -0,0 +1,116 @@
+"""Game loop on asyncio event loop, reading the keys as soon as they arrive.
+
+Terminal is registered with loop.add_reader(), so pressed keys are read and
+timestamped the moment they come, not when the next tic polls them. A key
+also wakes the loop: the next tic is played right away if at least half of
+the current one is over. Tics run early only within this margin and stay on
+the tic clock schedule, so the game speed doesn't depend on the typing.
+"""
+import asyncio
+import statistics
+import sys
+import time
+from collections import deque
+
+from curses_tools import get_controls
+from game_clock import TicClock
+
+
+# Part of the tic, the next tic may be played ahead of its deadline when a key arrives
+EARLY_TIC_FRACTION = 0.5
+
+
+class InputEvents:
+    """Keys read from the terminal with their arrival time, working as a controls reader.
+
+    Every tic it turns the keys arrived since the previous one into controls.
+    Call shown() after the frame is refreshed to measure input latency —
+    time from the key arrival to the frame showing its effect.
+    """
+
+    def __init__(self, fd=None, clock=time.monotonic):
+        self.fd = sys.stdin.fileno() if fd is None else fd
+        self._clock = clock
+        self.events = deque()
+        self.arrived = asyncio.Event()
+        self._used_events = []
+        self.latencies = []
+
+    def read_ready(self, canvas):
+        """Read all pending keys, called by event loop when the terminal is readable."""
+
+        arrived_at = self._clock()
+        for key_code in iter(canvas.getch, -1):
+            self.events.append((arrived_at, key_code))
+        if self.events:
+            self.arrived.set()
+
+    def __call__(self, canvas):
+        self.read_ready(canvas)
+        events = list(self.events)
+        self.events.clear()
+        self.arrived.clear()
+        self._used_events.extend(events)
+        return get_controls(key_code for _, key_code in events)
+
+    def shown(self):
+        shown_at = self._clock()
+        self.latencies.extend(shown_at - arrived_at for arrived_at, _ in self._used_events)
+        self._used_events.clear()
+
+    def get_report(self):
+        if not self.latencies:
+            return 'Input latency: no keys pressed'
+        return (
+            f'Input latency: mean {statistics.mean(self.latencies) * 1000:.1f} ms, '
+            f'max {max(self.latencies) * 1000:.1f} ms of {len(self.latencies)} keys'
+        )
+
+
+class EventLoopTicClock(TicClock):
+    """Tic clock leaving the wait for the next tic to asyncio event loop.
+
+    tick() only counts the tics, time it would sleep is kept in delay attribute.
+    """
+
+    def __init__(self, tic_timeout, max_tics_per_render=1, clock=time.monotonic):
+        super().__init__(tic_timeout, max_tics_per_render, clock, sleep=self._keep_delay)
+        self.delay = 0
+
+    def _keep_delay(self, seconds):
+        self.delay = seconds
+
+    def tick(self):
+        self.delay = 0
+        return super().tick()
+
+
+async def wait_next_tic(tic_clock, input_events):
+    """Wait for the delay of tic clock, or for a key arriving not earlier than EARLY_TIC_FRACTION of the tic before its end."""
+
+    started_at = time.monotonic()
+    if tic_clock.delay <= 0:
+        return
+    try:
+        await asyncio.wait_for(input_events.arrived.wait(), tic_clock.delay)
+    except asyncio.TimeoutError:
+        return
+    earliest_start = started_at + tic_clock.delay - tic_clock.tic_timeout * EARLY_TIC_FRACTION
+    await asyncio.sleep(max(earliest_start - time.monotonic(), 0))
+
+
+async def run_game_loop(canvas, play_tics, tic_clock, input_events):
+    """Call play_tics(tics) on the schedule of EventLoopTicClock, reading the keys as soon as they arrive."""
+
+    loop = asyncio.get_running_loop()
+    loop.add_reader(input_events.fd, input_events.read_ready, canvas)
+    try:
+        tic_clock.start()
+        tics = 1
+        while True:
+            play_tics(tics)
+            input_events.shown()
+            tics = tic_clock.tick()
+            await wait_next_tic(tic_clock, input_events)
+    finally:
+        loop.remove_reader(input_events.fd)
@@ -0,0 +1,91 @@
+FULL_QUALITY = 0
+STILL_STARS = 1
+REDUCED_EFFECTS = 2
+SKIPPED_RENDERS = 3
+QUALITY_NAMES = ('full', 'still stars', 'reduced effects', 'skipped renders')
+
+# Part of a new load measure added to the smoothed load
+LOAD_SMOOTHING = 0.2
+PARTICLES_STEP = 2
+YEAR_UPDATE_TICS = 10
+RENDER_STEP = 2
+
+
+class LoadGovernor:
+    """Shed cosmetic work when the game loop doesn't fit the tic budget, so simulation stays on schedule.
+
+    Load is the part of the tic budget spent on work, smoothed over recent
+    renders. Quality drops a level after degrade_renders renders in a row
+    loaded over high_load, and rises back after improve_renders renders
+    under low_load. Gap between the thresholds and the longer wait before
+    rising keep the quality level from flickering.
+    """
+
+    def __init__(self, tic_timeout, high_load=0.9, low_load=0.5, degrade_renders=3, improve_renders=50):
+        self.tic_timeout = tic_timeout
+        self.high_load = high_load
+        self.low_load = low_load
+        self.degrade_renders = degrade_renders
+        self.improve_renders = improve_renders
+        self.quality = FULL_QUALITY
+        self.load = 0.0
+        self.renders_by_quality = [0] * len(QUALITY_NAMES)
+        self._loaded_renders = 0
+        self._light_renders = 0
+        self._render_calls = 0
+
+    @property
+    def quality_name(self):
+        return QUALITY_NAMES[self.quality]
+
+    @property
+    def stars_blink(self):
+        return self.quality < STILL_STARS
+
+    @property
+    def particles_step(self):
+        """Emit only every n-th particle of explosion bursts."""
+
+        return PARTICLES_STEP if self.quality >= REDUCED_EFFECTS else 1
+
+    @property
+    def year_update_tics(self):
+        return YEAR_UPDATE_TICS if self.quality >= REDUCED_EFFECTS else 1
+
+    def should_render(self):
+        """Tell if the screen should be rendered after the tics simulated now."""
+
+        self._render_calls += 1
+        if self.quality < SKIPPED_RENDERS:
+            return True
+        return self._render_calls % RENDER_STEP == 0
+
+    def update(self, work_time, tics=1):
+        """Count time spent on simulating given amount of tics and rendering them, change quality if needed."""
+
+        self.renders_by_quality[self.quality] += 1
+        self.load += (work_time / (tics * self.tic_timeout) - self.load) * LOAD_SMOOTHING
+
+        if self.load > self.high_load:
+            self._loaded_renders += 1
+            self._light_renders = 0
+        elif self.load < self.low_load:
+            self._light_renders += 1
+            self._loaded_renders = 0
+        else:
+            self._loaded_renders = self._light_renders = 0
+
+        if self._loaded_renders >= self.degrade_renders and self.quality < SKIPPED_RENDERS:
+            self.quality += 1
+            self._loaded_renders = 0
+        elif self._light_renders >= self.improve_renders and self.quality > FULL_QUALITY:
+            self.quality -= 1
+            self._light_renders = 0
+
+    def get_report(self):
+        renders = ', '.join(
+            f'{name}: {renders_amount}'
+            for name, renders_amount in zip(QUALITY_NAMES, self.renders_by_quality)
+            if renders_amount
+        )
+        return f'Quality: {self.quality_name}, renders by quality — {renders}'
@@ -1,78 +1,62 @@
+import argparse
 import asyncio
 import curses
-import time
+import random
+import sys
+from functools import partial
 from itertools import cycle
-from random import randint, choice
-
+from time import perf_counter
+
+from ansi_screen import AnsiWindow
+from asciicast import AsciicastRecorder
+from assets import load_sprite
+from frame_buffer import FrameBuffer
+from game_clock import TicClock
+from input_events import EventLoopTicClock, InputEvents, run_game_loop
+from load_governor import LoadGovernor
+from particles import ParticleSystem, animate_particles
 from physics import update_speed
-from obstacles import Obstacle
+from profiler import TicProfiler, show_profile
+from projectiles import Gun, ProjectilePool
+from replay import ControlsRecorder, ControlsReplayer, load_input_log, save_input_log
+from scheduler import Scheduler, sleep
+from spectator_server import FrameBroadcaster, SpectatorServer
+from starfield import StarField, blink_stars
+from viewport import Viewport
+from obstacles import CollisionMask, ObstacleStore
 from explosion import explode
-from curses_tools import draw_frame, get_frame_size, read_controls
-from game_scenario import PHRASES, get_garbage_delay_tics
+from curses_tools import beep, draw_frame, get_frame_size, read_controls
+from game_scenario import DEFAULT_SCENARIO_PATH, Scenario, SpawnTimeline
 
 
 TIC_TIMEOUT = 0.1
-STARS_AMOUNT = 100
-
+MAX_TICS_PER_RENDER = 3
+FIRE_INTERVAL_TICS = 1
+VOLLEY_SIZE = 1
+# Columns speed of the side shots of a volley
+SPREAD = 0
 
-async def sleep(tics=1):
-    for _ in range(tics):
-        await asyncio.sleep(0)
 
+async def fly_shots(canvas):
+    """Move all shots in one pass per tic, blowing up garbage they hit."""
 
-async def blink(canvas, row, column, offset_tics, symbol='*'):
-    """Display animation of blinking star, position and symbol can be specified."""
+    def blow_up(obstacle):
+        obstacles.remove(obstacle)
+        game_stats['obstacles_destroyed'] += 1
+        frame_center_row = int(obstacle.row + obstacle.rows_size / 2)
+        frame_center_column = int(obstacle.column + obstacle.columns_size / 2)
+        scheduler.spawn(explode(canvas, frame_center_row, frame_center_column, governor, particles))
 
     while True:
-        canvas.addstr(row, column, symbol, curses.A_DIM)
-        await sleep(20 + offset_tics)
-        canvas.addstr(row, column, symbol)
-        await sleep(3)
-        canvas.addstr(row, column, symbol, curses.A_BOLD)
-        await sleep(5)
-        canvas.addstr(row, column, symbol)
-        await sleep(3)
-
-
-async def fire(canvas, start_row, start_column, rows_speed=-0.5, columns_speed=0):
-    """Display animation of gun shot, direction and speed can be specified."""
-
-    row, column = start_row, start_column
-
-    canvas.addstr(round(row), round(column), '*')
-    await sleep()
-
-    canvas.addstr(round(row), round(column), 'O')
-    await sleep()
-    canvas.addstr(round(row), round(column), ' ')
-
-    row += rows_speed
-    column += columns_speed
-
-    symbol = '-' if columns_speed else '|'
-
-    rows, columns = canvas.getmaxyx()
-    max_row, max_column = rows - 1, columns - 1
-
-    curses.beep()
-
-    while 0 < row < max_row and 0 < column < max_column:
-        for obstacle in obstacles:
-            if obstacle.has_collision(row, column):
-                obstacles_in_last_collisions.append(obstacle)
-                return
-        canvas.addstr(round(row), round(column), symbol)
+        projectiles.update(canvas, obstacles, blow_up)
         await sleep()
-        canvas.addstr(round(row), round(column), ' ')
-        row += rows_speed
-        column += columns_speed
 
 
-async def display_rocket(canvas, rocket_frames, max_speed=3):
-    """Display rocket movement animation."""
+async def display_rocket(viewport, rocket_frames, rocket_masks, controls_reader=read_controls, max_speed=3):
+    """Display rocket movement animation, viewport follows the rocket across the world."""
 
     # window.getmaxyx() actually returns total number of rows and columns:
-    rows_number, columns_number = canvas.getmaxyx()
+    rows_number, columns_number = viewport.getmaxyx()
 
     # Since row and column numeration starts at zero:
     max_row, max_column = rows_number - 1, columns_number - 1
@@ -88,8 +72,8 @@ async def display_rocket(canvas, rocket_frames, max_speed=3):
 
     row_speed = column_speed = 0
 
-    for frame in cycle(rocket_frames):
-        row_direction, column_direction, space_pressed = read_controls(canvas)
+    for frame, mask in cycle(zip(rocket_frames, rocket_masks)):
+        row_direction, column_direction, space_pressed = controls_reader(viewport.canvas)
         row_speed, column_speed = update_speed(
             row_speed,
             column_speed,
@@ -116,76 +100,65 @@ async def display_rocket(canvas, rocket_frames, max_speed=3):
         else:
             column = min_column_within_borders
         if space_pressed and current_year >= 2020:
-            coroutines.append(fire(canvas, row, column + int(frame_width / 2)))
-        draw_frame(canvas, row, column, frame)
+            shots_fired = gun.fire(row, column + int(frame_width / 2), scheduler.tic)
+            if shots_fired:
+                beep()
+                game_stats['shots_fired'] += shots_fired
+        viewport.follow(column + frame_width / 2)
+        draw_frame(viewport, row, column, frame)
         await sleep()
-        draw_frame(canvas, row, column, frame, negative=True)
-
-        for obstacle in obstacles:
-            if obstacle.has_collision(row, column + int(frame_width / 2)):
-                global game_over
-                game_over = True
-                coroutines.append(show_gameover(canvas))
-                return
-
+        draw_frame(viewport, row, column, frame, negative=True)
 
-async def fly_garbage(canvas, column, garbage_frame, speed=0.5):
-    """Animate garbage, flying from top to bottom. Сolumn position will stay same, as specified on start."""
+        if obstacles.get_collided_obstacles(mask, row, column):
+            global game_over
+            game_over = True
+            scheduler.spawn(show_gameover(viewport.canvas))
+            return
 
-    rows_number, columns_number = canvas.getmaxyx()
 
-    row = 1
+async def fly_garbage(viewport, garbage_frames):
+    """Animate all garbage, flying from top to bottom. Only garbage within the viewport is drawn."""
 
-    frame_rows_number, frame_columns_number = get_frame_size(garbage_frame)
+    rows_number, _ = viewport.getmaxyx()
 
-    while row < rows_number:
-        try:
-            obstacle = Obstacle(
-                row,
-                column,
-                frame_rows_number,
-                frame_columns_number
-            )
-            obstacles.append(obstacle)
-            draw_frame(canvas, row, column, garbage_frame)
-            await sleep()
-            draw_frame(canvas, row, column, garbage_frame, negative=True)
-            row += speed
-
-            frame_center_row = int(row + frame_rows_number / 2)
-            frame_center_column = int(column + frame_columns_number / 2)
-
-            if obstacle in obstacles_in_last_collisions:
-                obstacles_in_last_collisions.remove(obstacle)
-                coroutines.append(
-                    explode(canvas, frame_center_row, frame_center_column)
-                )
-                return
-            if game_over:
-                return
-        finally:
-            obstacles.remove(obstacle)
-
-
-async def fill_orbit_with_garbage(canvas, garbage_frames, max_column_within_borders):
-    while not game_over:
-        garbage_delay_tics = get_garbage_delay_tics(current_year)
-        frame = choice(garbage_frames)
-        _, frame_columns_number = get_frame_size(frame)
-        if garbage_delay_tics:
-            coroutines.append(
-                fly_garbage(
-                    canvas,
-                    column=randint(
-                        1,
-                        max_column_within_borders - frame_columns_number
-                    ),
-                    garbage_frame=frame,
-                )
-            )
-            await sleep(garbage_delay_tics)
-        else:
-            await sleep(1)
+    while True:
+        drawn_garbage = [
+            (obstacle.row, obstacle.column, garbage_frames[obstacle.frame_id])
+            for obstacle in obstacles.get_obstacles_in_area(0, viewport.left, rows_number, viewport.columns_number)
+        ]
+        for row, column, frame in drawn_garbage:
+            draw_frame(viewport, row, column, frame)
+        await sleep()
+        for row, column, frame in drawn_garbage:
+            draw_frame(viewport, row, column, frame, negative=True)
+
+        if game_over:
+            obstacles.clear()
+            return
+
+        obstacles.advance(max_row=rows_number)
+        game_stats['peak_obstacles'] = max(game_stats['peak_obstacles'], len(obstacles))
+
+
+async def fill_orbit_with_garbage(spawn_timeline, garbage_sizes):
+    """Throw garbage to the world at the tics of the spawn timeline."""
+
+    tic = 0
+    for spawn_tic, frame_id, column, speed in spawn_timeline:
+        if spawn_tic > tic:
+            await sleep(spawn_tic - tic)
+            tic = spawn_tic
+        if game_over:
+            return
+        frame_rows_number, frame_columns_number = garbage_sizes[frame_id]
+        obstacles.add(
+            row=1,
+            column=column,
+            rows_size=frame_rows_number,
+            columns_size=frame_columns_number,
+            speed=speed,
+            frame_id=frame_id,
+        )
 
 
 async def show_gameover(canvas):
@@ -193,8 +166,7 @@ async def show_gameover(canvas):
     max_row, max_column = rows_number - 1, columns_number - 1
     max_row_within_borders = max_row - 1
     max_column_within_borders = max_column - 1
-    with open('frames/gameover_frame.txt', 'r') as frame_file:
-        game_over_frame = frame_file.read()
+    game_over_frame = load_sprite('gameover_frame')
     frame_rows_number, frame_columns_number = get_frame_size(game_over_frame)
     frame_position_row = int(
         max_row_within_borders / 2 - frame_rows_number / 2
@@ -224,7 +196,7 @@ async def show_gameover(canvas):
 async def pass_years():
     global current_year
     while not game_over:
-        await sleep(15)
+        await sleep(scenario.year_tics)
         current_year += 1
 
 
@@ -239,7 +211,7 @@ async def draw_year(canvas):
         columns_number - year_window_columns - 1
     )
     while not game_over:
-        phrase = PHRASES.get(current_year)
+        phrase = scenario.get_phrase(current_year)
         if phrase:
             frame = f'{current_year} - {phrase}'
         else:
@@ -257,7 +229,7 @@ async def draw_year(canvas):
             frame_position_row,
             frame_position_column,
             frame)
-        await sleep()
+        await sleep(governor.year_update_tics)
         draw_frame(
             year_window,
             frame_position_row,
@@ -267,98 +239,302 @@ async def draw_year(canvas):
         )
 
 
-def draw(canvas):
+def reset_game_state(seed=None, scenario_path=DEFAULT_SCENARIO_PATH):
+    global rng, scheduler, governor, obstacles, projectiles, gun, particles, scenario, current_year, game_over, game_stats
+    rng = random.Random(seed)
+    scheduler = Scheduler()
+    governor = LoadGovernor(TIC_TIMEOUT)
+    obstacles = ObstacleStore()
+    projectiles = ProjectilePool()
+    gun = Gun(
+        projectiles,
+        fire_interval_tics=FIRE_INTERVAL_TICS,
+        volley_size=VOLLEY_SIZE,
+        spread=SPREAD,
+    )
+    # Own random generator keeps the game itself the same however many particles explosions emit
+    particles = ParticleSystem(rng=random.Random(rng.getrandbits(32)))
+    scenario = Scenario.load(scenario_path)
+    current_year = scenario.start_year
+    game_over = False
+    game_stats = {
+        'shots_fired': 0,
+        'obstacles_destroyed': 0,
+        'peak_obstacles': 0,
+    }
+
+
+def start_game(canvas, controls_reader=read_controls, world_screens=1):
+    """Spawn coroutines of a new game, drawing on a given canvas.
+
+    World of the game is world_screens times wider than the canvas,
+    it scrolls sideways following the rocket.
+    """
+
     canvas.border()
 
     # window.getmaxyx() actually returns total number of rows and columns:
     rows_number, columns_number = canvas.getmaxyx()
+    viewport = Viewport(canvas, columns_number * world_screens)
 
     # Since row and column numeration starts at zero:
-    max_row, max_column = rows_number - 1, columns_number - 1
+    max_column = viewport.world_columns_number - 1
 
-    # Since we want stars to be displayed in the area within borders:
-    max_row_within_borders = max_row - 1
+    # Since we want garbage to be displayed in the area within borders:
     max_column_within_borders = max_column - 1
-    min_row_within_borders = min_column_within_borders = 1
-
-    curses.curs_set(False)
-    canvas.nodelay(True)
 
-    rocket_frame_files = [
-        'rocket_frame_1.txt',
-        'rocket_frame_2.txt'
-    ]
-
-    garbage_frame_files = [
-        'duck.txt',
-        'hubble.txt',
-        'lamp.txt',
-        'trash_large.txt',
-        'trash_small.txt',
-        'trash_xl.txt'
+    rocket_frame_names = [
+        'rocket_frame_1',
+        'rocket_frame_2'
     ]
 
     rocket_frames = []
-    for file in rocket_frame_files:
-        with open(f'frames/rocket_frames/{file}', 'r') as frame_file:
-            frame = frame_file.read()
-            rocket_frames.append(frame)
-            rocket_frames.append(frame)
-
-    garbage_frames = []
-    for file in garbage_frame_files:
-        with open(f'frames/garbage_frames/{file}', 'r') as frame_file:
-            frame = frame_file.read()
-            garbage_frames.append(frame)
-            garbage_frames.append(frame)
-
-    star_coordinates = [(
-        randint(min_row_within_borders, max_row_within_borders),
-        randint(min_column_within_borders, max_column_within_borders)
-    ) for _ in range(STARS_AMOUNT)]
-    star_symbols = '+*:.'
-
-    coroutines.extend(
-        [blink(
-            canvas,
-            coordinate[0],
-            coordinate[1],
-            randint(3, 12),
-            choice(star_symbols)
-        ) for coordinate in star_coordinates]
+    rocket_masks = []
+    for name in rocket_frame_names:
+        frame = load_sprite(f'rocket_frames/{name}')
+        mask = CollisionMask(frame)
+        rocket_frames.extend((frame, frame))
+        rocket_masks.extend((mask, mask))
+
+    garbage_frames = [load_sprite(f'garbage_frames/{name}') for name in scenario.frame_names]
+    garbage_sizes = [get_frame_size(frame) for frame in garbage_frames]
+    obstacles.masks = {frame_id: CollisionMask(frame) for frame_id, frame in enumerate(garbage_frames)}
+
+    star_field = StarField.generate(rng, rows_number, columns_number)
+    scheduler.spawn(blink_stars(canvas, star_field, governor))
+
+    scheduler.spawn(
+        display_rocket(viewport, rocket_frames, rocket_masks, controls_reader)
     )
 
-    coroutines.append(
-        display_rocket(canvas, rocket_frames)
+    scheduler.spawn(fly_garbage(viewport, garbage_frames))
+    scheduler.spawn(fly_shots(viewport))
+    scheduler.spawn(animate_particles(viewport, particles))
+    spawn_timeline = SpawnTimeline(
+        scenario,
+        [columns_size for _, columns_size in garbage_sizes],
+        max_column_within_borders,
+        world_screens,
+        seed=rng.getrandbits(32),
     )
+    scheduler.spawn(fill_orbit_with_garbage(spawn_timeline, garbage_sizes))
+
+    scheduler.spawn(draw_year(canvas))
+    scheduler.spawn(pass_years())
+
 
-    coroutines.append(
-        fill_orbit_with_garbage(
+async def dump_profile_on_game_over(profiler, path):
+    while not game_over:
+        await sleep()
+    profiler.dump(path)
+
+
+def play_tics(canvas, tics, profiler=None):
+    """Simulate given amount of tics and render the last of them, unless load governor skips the render."""
+
+    started_at = perf_counter()
+    if profiler is None:
+        for _ in range(tics):
+            scheduler.run_tic()
+            canvas.finish_tic()
+        if governor.should_render():
+            canvas.border()
+            canvas.refresh()
+    else:
+        # Every simulated tic is profiled on its own, the render is counted into the last one
+        for tic in range(tics, 0, -1):
+            profiler.start_tic()
+            scheduler.run_tic()
+            canvas.finish_tic()
+            if tic > 1:
+                profiler.finish_tic()
+        if governor.should_render():
+            with profiler.measure('border'):
+                canvas.border()
+            with profiler.measure('refresh'):
+                canvas.refresh()
+        profiler.finish_tic()
+    governor.update(perf_counter() - started_at, tics)
+
+
+def draw(
+    window,
+    profiler=None,
+    profile_path=None,
+    controls_reader=read_controls,
+    screen_size=None,
+    world_screens=1,
+    spectator_server=None,
+    input_events=None,
+    backend='curses',
+    asciicast_recorder=None,
+):
+    curses.curs_set(False)
+    window.nodelay(True)
+
+    if screen_size is not None:
+        # Replayed game has to run on a screen of the same size as recorded one
+        rows_number, columns_number = screen_size
+        window_rows_number, window_columns_number = window.getmaxyx()
+        if window_rows_number < rows_number or window_columns_number < columns_number:
+            sys.exit(f'Terminal should be at least {columns_number}x{rows_number} to replay this game.')
+        window = window.derwin(rows_number, columns_number, 0, 0)
+
+    if backend == 'ansi':
+        window = AnsiWindow(window)
+    canvas = FrameBuffer(window)
+    if spectator_server is not None:
+        canvas.observers.append(FrameBroadcaster(spectator_server))
+    if asciicast_recorder is not None:
+        canvas.observers.append(asciicast_recorder)
+    start_game(canvas, controls_reader, world_screens)
+
+    if profiler is not None:
+        scheduler.profiler = profiler
+        scheduler.spawn(show_profile(canvas, profiler))
+        scheduler.spawn(dump_profile_on_game_over(profiler, profile_path))
+
+    if input_events is None:
+        tic_clock.start()
+        tics = 1
+        while True:
+            play_tics(canvas, tics, profiler)
+            tics = tic_clock.tick()
+    else:
+        asyncio.run(run_game_loop(
             canvas,
-            garbage_frames,
-            max_column_within_borders
-        )
-    )
+            partial(play_tics, canvas, profiler=profiler),
+            tic_clock,
+            input_events,
+        ))
 
-    coroutines.append(draw_year(canvas))
-    coroutines.append(pass_years())
 
-    while True:
-        for coroutine in coroutines.copy():
-            try:
-                coroutine.send(None)
-            except StopIteration:
-                coroutines.remove(coroutine)
-        canvas.refresh()
-        canvas.border()
-        time.sleep(TIC_TIMEOUT)
+def positive_int(value):
+    """Argparse type of counts that can't be zero or negative."""
+
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'expects 1 or more, got {number}')
+    return number
 
 
 if __name__ == '__main__':
-    coroutines = []
-    obstacles = []
-    obstacles_in_last_collisions = []
-    current_year = 1957
-    game_over = False
+    parser = argparse.ArgumentParser(description='Fly the rocket through the space garbage.')
+    parser.add_argument(
+        '--profile',
+        metavar='PATH',
+        help='show time spent per coroutine type and save it to JSON or CSV file at game over',
+    )
+    parser.add_argument('--seed', type=int, help='random seed of the game')
+    parser.add_argument('--record', metavar='PATH', help='save input log of the game to replay it later')
+    parser.add_argument('--replay', metavar='PATH', help='replay the game from input log')
+    parser.add_argument('--unthrottled', action='store_true', help='replay as fast as possible')
+    parser.add_argument(
+        '--polling',
+        action='store_true',
+        help='read the keys once per tic instead of the moment they arrive',
+    )
+    parser.add_argument(
+        '--world-screens',
+        type=positive_int,
+        default=1,
+        metavar='N',
+        help='make the world N screens wide, scrolling after the rocket',
+    )
+    parser.add_argument(
+        '--scenario',
+        default=DEFAULT_SCENARIO_PATH,
+        metavar='PATH',
+        help='JSON file with the scenario of garbage and phrases by year',
+    )
+    parser.add_argument(
+        '--asciicast',
+        metavar='PATH',
+        help='record the screen to asciicast v2 file, compressed if it ends with .gz, .bz2 or .xz',
+    )
+    parser.add_argument(
+        '--backend',
+        choices=('curses', 'ansi'),
+        default='curses',
+        help='draw through curses or write ANSI escape sequences to the terminal directly',
+    )
+    parser.add_argument(
+        '--spectate-port',
+        type=int,
+        metavar='PORT',
+        help='stream the game to spectators connecting to this local port',
+    )
+    args = parser.parse_args()
+
+    profiler = TicProfiler(TIC_TIMEOUT) if args.profile else None
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    # Unthrottled game doesn't wait for the tics, so there is nothing to wake up on keys
+    input_events = None if args.polling or args.replay or args.unthrottled else InputEvents()
+    controls_reader = input_events or read_controls
+    screen_size = None
+    world_screens = args.world_screens
+    scenario_path = args.scenario
+    if args.replay:
+        try:
+            input_log_header, controls_log = load_input_log(args.replay)
+        except ValueError as error:
+            sys.exit(f'Can\'t replay {args.replay}: {error}')
+        seed = input_log_header['seed']
+        screen_size = input_log_header['rows'], input_log_header['columns']
+        world_screens = input_log_header.get('world_screens', 1)
+        scenario_path = input_log_header.get('scenario', DEFAULT_SCENARIO_PATH)
+        controls_reader = ControlsReplayer(controls_log)
+    elif args.record:
+        controls_reader = ControlsRecorder(read=controls_reader)
+
+    spectator_server = None
+    if args.spectate_port is not None:
+        spectator_server = SpectatorServer(port=args.spectate_port)
+        try:
+            spectator_server.start()
+        except OSError as error:
+            sys.exit(f'Spectator server can\'t listen on port {args.spectate_port}: {error}')
+
+    asciicast_recorder = AsciicastRecorder(args.asciicast) if args.asciicast else None
+
+    reset_game_state(seed, scenario_path)
+    if args.unthrottled:
+        tic_clock = TicClock(TIC_TIMEOUT, sleep=lambda seconds: None)
+    elif input_events is None:
+        tic_clock = TicClock(TIC_TIMEOUT, max_tics_per_render=MAX_TICS_PER_RENDER)
+    else:
+        tic_clock = EventLoopTicClock(TIC_TIMEOUT, max_tics_per_render=MAX_TICS_PER_RENDER)
     curses.update_lines_cols()
-    curses.wrapper(draw)
+    try:
+        curses.wrapper(partial(
+            draw,
+            profiler=profiler,
+            profile_path=args.profile,
+            controls_reader=controls_reader,
+            screen_size=screen_size,
+            world_screens=world_screens,
+            spectator_server=spectator_server,
+            input_events=input_events,
+            backend=args.backend,
+            asciicast_recorder=asciicast_recorder,
+        ))
+    except KeyboardInterrupt:
+        pass
+    if asciicast_recorder is not None:
+        asciicast_recorder.close()
+    if profiler is not None and not game_over:
+        profiler.dump(args.profile)
+    if args.record and controls_reader.screen_size:
+        save_input_log(
+            args.record,
+            seed,
+            *controls_reader.screen_size,
+            controls_reader.controls_log,
+            world_screens,
+            scenario_path,
+        )
+    print(tic_clock.get_report())
+    print(governor.get_report())
+    if input_events is not None:
+        print(input_events.get_report())
@@ -1,5 +1,12 @@
 import asyncio
-from curses_tools import draw_frame
+from array import array
+from collections import defaultdict
+from itertools import compress
+
+from curses_tools import draw_frame, get_sprite
+
+
+GRID_CELL_SIZE = 8
 
 
 class Obstacle:
@@ -33,6 +40,106 @@ class Obstacle:
         )
 
 
+class CollisionMask:
+    """Shape of a frame as bit masks of its rows, bit number is a column number.
+
+    Row is filled from its first to its last non-space symbol,
+    so gaps inside outlines of a frame count as its body.
+    """
+
+    def __init__(self, frame):
+        sprite = get_sprite(frame) if isinstance(frame, str) else frame
+        self.rows_number = sprite.rows_number
+        self.columns_number = sprite.columns_number
+
+        row_spans = {}
+        for row, column, _ in sprite.cells:
+            first_column, last_column = row_spans.get(row, (column, column))
+            row_spans[row] = min(first_column, column), max(last_column, column)
+
+        row_masks = [0] * self.rows_number
+        for row, (first_column, last_column) in row_spans.items():
+            row_masks[row] = ((1 << (last_column - first_column + 1)) - 1) << first_column
+        self.row_masks = tuple(row_masks)
+
+    def has_point(self, row, column):
+        """Check if a cell given relative to the mask corner is filled."""
+
+        if 0 <= row < self.rows_number and 0 <= column:
+            return bool(self.row_masks[row] >> column & 1)
+        return False
+
+    def overlaps(self, row, column, other, other_row, other_column):
+        """Check if the mask placed at (row, column) overlaps other mask placed at (other_row, other_column)."""
+
+        # Frames are drawn at rounded positions, so they collide as drawn
+        row, column = round(row), round(column)
+        other_row, other_column = round(other_row), round(other_column)
+
+        shift = other_column - column
+        if shift >= self.columns_number or -shift >= other.columns_number:
+            return False
+
+        first_row = max(row, other_row)
+        last_row = min(row + self.rows_number, other_row + other.rows_number)
+
+        row_masks, other_row_masks = self.row_masks, other.row_masks
+        for current_row in range(first_row, last_row):
+            row_mask = row_masks[current_row - row]
+            other_row_mask = other_row_masks[current_row - other_row]
+            if shift >= 0:
+                other_row_mask <<= shift
+            else:
+                row_mask <<= -shift
+            if row_mask & other_row_mask:
+                return True
+        return False
+
+
+class ObstacleView(Obstacle):
+    """Obstacle stored in a slot of ObstacleStore, reading and writing its arrays."""
+
+    def __init__(self, store, slot):
+        self.store = store
+        self.slot = slot
+
+    @property
+    def uid(self):
+        return self.slot
+
+    @property
+    def row(self):
+        return self.store.rows[self.slot]
+
+    @row.setter
+    def row(self, value):
+        self.store.rows[self.slot] = value
+
+    @property
+    def column(self):
+        return self.store.columns[self.slot]
+
+    @column.setter
+    def column(self, value):
+        self.store.columns[self.slot] = value
+
+    @property
+    def rows_size(self):
+        return self.store.rows_sizes[self.slot]
+
+    @property
+    def columns_size(self):
+        return self.store.columns_sizes[self.slot]
+
+    @property
+    def speed(self):
+        return self.store.speeds[self.slot]
+
+    @property
+    def frame_id(self):
+        return self.store.frame_ids[self.slot]
+
+
 def _get_bounding_box_lines(rows, columns):
     yield ' ' + '-' * columns + ' '
     for _ in range(rows):
@@ -40,6 +147,207 @@ def _get_bounding_box_lines(rows, columns):
     yield ' ' + '-' * columns + ' '
 
 
+class ObstacleGrid:
+    """Spatial hash of obstacles bucketed into square cells of the same size.
+
+    Obstacles have to be re-registered with update() after they moved,
+    queries only check obstacles from the cells covering requested area.
+    Queries return obstacles in the same order from run to run, so seeded
+    games and replays collide and draw them identically.
+    """
+
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self._buckets = defaultdict(list)
+        self._obstacles_cells = {}
+
+    def __len__(self):
+        return len(self._obstacles_cells)
+
+    def __iter__(self):
+        return iter(list(self._obstacles_cells))
+
+    def __contains__(self, obstacle):
+        return obstacle in self._obstacles_cells
+
+    def _get_cells(self, row, column, rows_size, columns_size):
+        cell_size = self.cell_size
+        first_row, last_row = int(row // cell_size), int((row + rows_size) // cell_size)
+        first_column, last_column = int(column // cell_size), int((column + columns_size) // cell_size)
+        return tuple(
+            (cell_row, cell_column)
+            for cell_row in range(first_row, last_row + 1)
+            for cell_column in range(first_column, last_column + 1)
+        )
+
+    def add(self, obstacle):
+        cells = self._get_cells(obstacle.row, obstacle.column, obstacle.rows_size, obstacle.columns_size)
+        self._obstacles_cells[obstacle] = cells
+        for cell in cells:
+            self._buckets[cell].append(obstacle)
+
+    def remove(self, obstacle):
+        for cell in self._obstacles_cells.pop(obstacle):
+            bucket = self._buckets[cell]
+            bucket.remove(obstacle)
+            if not bucket:
+                del self._buckets[cell]
+
+    def update(self, obstacle):
+        """Move obstacle to the cells matching its current position."""
+
+        cells = self._get_cells(obstacle.row, obstacle.column, obstacle.rows_size, obstacle.columns_size)
+        if cells == self._obstacles_cells[obstacle]:
+            return
+        self.remove(obstacle)
+        self._obstacles_cells[obstacle] = cells
+        for cell in cells:
+            self._buckets[cell].append(obstacle)
+
+    def get_obstacles_in_area(self, row, column, rows_size=1, columns_size=1):
+        """Return obstacles colliding with given cell or rectangle, ordered by cell and by bucket."""
+
+        cells = self._get_cells(row, column, rows_size, columns_size)
+        if len(cells) == 1:
+            candidates = self._buckets.get(cells[0], ())
+        else:
+            # Obstacles spanning several cells are met more than once. Set would dedupe them
+            # in the order of id() hashes, which differs from run to run, dict keeps the first meeting
+            candidates = dict.fromkeys(
+                obstacle
+                for cell in cells
+                for obstacle in self._buckets.get(cell, ())
+            )
+        return [
+            obstacle for obstacle in candidates
+            if obstacle.has_collision(row, column, rows_size, columns_size)
+        ]
+
+
+class ObstacleStore:
+    """Obstacles kept column-wise in arrays, moved and tested for collisions in batches.
+
+    Every obstacle takes a slot in the arrays, slots of removed obstacles are
+    reused. One ObstacleView is made per slot and reused as well, so adding
+    and moving obstacles allocates nothing once the store has grown.
+    """
+
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.rows = array('d')
+        self.columns = array('d')
+        self.rows_sizes = array('l')
+        self.columns_sizes = array('l')
+        self.speeds = array('d')
+        self.frame_ids = array('l')
+        self.alive = bytearray()
+        self.grid = ObstacleGrid(cell_size)
+        # Collision masks by frame ids, obstacles without a mask collide by bounding box
+        self.masks = {}
+        self._views = []
+        self._free_slots = []
+
+    def __len__(self):
+        return len(self.grid)
+
+    def __iter__(self):
+        return iter(list(compress(self._views, self.alive)))
+
+    def __contains__(self, obstacle):
+        return obstacle.store is self and self.alive[obstacle.slot]
+
+    def add(self, row, column, rows_size=1, columns_size=1, speed=0, frame_id=0):
+        """Put new obstacle to the store, return its view."""
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self.rows[slot], self.columns[slot] = row, column
+            self.rows_sizes[slot], self.columns_sizes[slot] = rows_size, columns_size
+            self.speeds[slot], self.frame_ids[slot] = speed, frame_id
+            self.alive[slot] = 1
+        else:
+            slot = len(self.alive)
+            self.rows.append(row)
+            self.columns.append(column)
+            self.rows_sizes.append(rows_size)
+            self.columns_sizes.append(columns_size)
+            self.speeds.append(speed)
+            self.frame_ids.append(frame_id)
+            self.alive.append(1)
+            self._views.append(ObstacleView(self, slot))
+
+        obstacle = self._views[slot]
+        self.grid.add(obstacle)
+        return obstacle
+
+    def remove(self, obstacle):
+        self.grid.remove(obstacle)
+        self.alive[obstacle.slot] = 0
+        self._free_slots.append(obstacle.slot)
+
+    def clear(self):
+        for obstacle in self:
+            self.remove(obstacle)
+
+    def advance(self, max_row=None):
+        """Move all obstacles by their speed. Remove ones reaching max_row, return amount of them."""
+
+        rows, speeds, views = self.rows, self.speeds, self._views
+        update_grid = self.grid.update
+        left_obstacles = []
+
+        for slot in compress(range(len(self.alive)), self.alive):
+            row = rows[slot] + speeds[slot]
+            rows[slot] = row
+            if max_row is not None and row >= max_row:
+                left_obstacles.append(views[slot])
+            else:
+                update_grid(views[slot])
+
+        for obstacle in left_obstacles:
+            self.remove(obstacle)
+        return len(left_obstacles)
+
+    def get_obstacles_in_area(self, row, column, rows_size=1, columns_size=1):
+        """Return obstacles colliding with given cell or rectangle."""
+
+        return self.grid.get_obstacles_in_area(row, column, rows_size, columns_size)
+
+    def get_collided_obstacles(self, mask, row, column):
+        """Return obstacles overlapping given mask placed at (row, column).
+
+        Obstacles are found by bounding boxes first, then tested by their masks.
+        """
+
+        collided_obstacles = []
+        masks = self.masks
+        for obstacle in self.grid.get_obstacles_in_area(row, column, mask.rows_number, mask.columns_number):
+            obstacle_mask = masks.get(obstacle.frame_id)
+            if obstacle_mask is None or obstacle_mask.overlaps(
+                obstacle.row, obstacle.column, mask, row, column
+            ):
+                collided_obstacles.append(obstacle)
+        return collided_obstacles
+
+    def collide_points(self, points):
+        """Test all points at once. Return list with collided obstacle or None for every point."""
+
+        get_obstacles_in_area = self.grid.get_obstacles_in_area
+        masks = self.masks
+        collisions = []
+        for row, column in points:
+            collided_obstacle = None
+            for obstacle in get_obstacles_in_area(row, column):
+                obstacle_mask = masks.get(obstacle.frame_id)
+                if obstacle_mask is None or obstacle_mask.has_point(
+                    round(row) - round(obstacle.row),
+                    round(column) - round(obstacle.column),
+                ):
+                    collided_obstacle = obstacle
+                    break
+            collisions.append(collided_obstacle)
+        return collisions
+
+
 async def show_obstacles(canvas, obstacles):
     """Display bounding boxes of every obstacle in a list"""
 
@@ -58,30 +366,12 @@ async def show_obstacles(canvas, obstacles):
             draw_frame(canvas, row, column, frame, negative=True)
 
 
-def _is_point_inside(corner_row, corner_column, size_rows, size_columns, point_row, point_row_column):
-    rows_flag = corner_row <= point_row < corner_row + size_rows
-    columns_flag = corner_column <= point_row_column < corner_column + size_columns
-
-    return rows_flag and columns_flag
-
-
 def has_collision(obstacle_corner, obstacle_size, obj_corner, obj_size=(1, 1)):
     '''Determine if collision has occured. Return True or False.'''
 
-    opposite_obstacle_corner = (
-        obstacle_corner[0] + obstacle_size[0] - 1,
-        obstacle_corner[1] + obstacle_size[1] - 1,
+    return (
+        obstacle_corner[0] < obj_corner[0] + obj_size[0]
+        and obj_corner[0] < obstacle_corner[0] + obstacle_size[0]
+        and obstacle_corner[1] < obj_corner[1] + obj_size[1]
+        and obj_corner[1] < obstacle_corner[1] + obstacle_size[1]
     )
-
-    opposite_obj_corner = (
-        obj_corner[0] + obj_size[0] - 1,
-        obj_corner[1] + obj_size[1] - 1,
-    )
-
-    return any([
-        _is_point_inside(*obstacle_corner, *obstacle_size, *obj_corner),
-        _is_point_inside(*obstacle_corner, *obstacle_size, *opposite_obj_corner),
-
-        _is_point_inside(*obj_corner, *obj_size, *obstacle_corner),
-        _is_point_inside(*obj_corner, *obj_size, *opposite_obstacle_corner),
-    ])
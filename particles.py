@@ -0,0 +1,99 @@
+import math
+import random
+from array import array
+
+from scheduler import sleep
+
+
+DEFAULT_CAPACITY = 8192
+BURST_SIZE = 40
+# Particles change their look as they get older, the last symbol is shown before they die
+GLYPHS_BY_AGE = '@*+:.'
+# Terminal cells are about twice as high as wide, so particles fly faster sideways to make a round burst
+COLUMNS_SPEED_SCALE = 2
+
+
+class ParticleSystem:
+    """Particles kept column-wise in arrays allocated once, all moved, aged and drawn in one pass per tic.
+
+    Bursts take free slots of the pool, particles which don't fit
+    the capacity are not emitted. Slots of live particles are listed,
+    so a tic costs as much as there are live particles, not the capacity.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, rng=None):
+        self.capacity = capacity
+        self.rng = rng or random.Random()
+        self.rows = array('d', [0]) * capacity
+        self.columns = array('d', [0]) * capacity
+        self.rows_speeds = array('d', [0]) * capacity
+        self.columns_speeds = array('d', [0]) * capacity
+        self.ages = array('l', [0]) * capacity
+        self.lifetimes = array('l', [0]) * capacity
+        self._live_slots = []
+        self._free_slots = list(reversed(range(capacity)))
+        self._drawn_cells = []
+
+    def __len__(self):
+        return len(self._live_slots)
+
+    def emit_burst(self, row, column, amount=BURST_SIZE, min_speed=0.2, max_speed=1, min_lifetime=4, max_lifetime=10):
+        """Emit particles flying from (row, column) in all directions. Return amount of emitted ones."""
+
+        rng = self.rng
+        emitted = 0
+        for _ in range(min(amount, len(self._free_slots))):
+            slot = self._free_slots.pop()
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(min_speed, max_speed)
+            self.rows[slot], self.columns[slot] = row, column
+            self.rows_speeds[slot] = speed * math.sin(angle)
+            self.columns_speeds[slot] = speed * math.cos(angle) * COLUMNS_SPEED_SCALE
+            self.ages[slot] = 0
+            self.lifetimes[slot] = rng.randint(min_lifetime, max_lifetime)
+            self._live_slots.append(slot)
+            emitted += 1
+        return emitted
+
+    def update(self, canvas):
+        """Erase particles drawn on the previous tic, move and age them, draw the living ones.
+
+        Particles die at the end of their lifetime or when they leave the area within canvas borders.
+        """
+
+        for row, column in self._drawn_cells:
+            canvas.addstr(row, column, ' ')
+
+        rows_number, columns_number = canvas.getmaxyx()
+        max_row, max_column = rows_number - 2, columns_number - 2
+        rows, columns = self.rows, self.columns
+        rows_speeds, columns_speeds = self.rows_speeds, self.columns_speeds
+        ages, lifetimes = self.ages, self.lifetimes
+        free_slots = self._free_slots
+        glyphs_amount = len(GLYPHS_BY_AGE)
+
+        live_slots = []
+        drawn_cells = []
+        for slot in self._live_slots:
+            age = ages[slot] + 1
+            row = rows[slot] + rows_speeds[slot]
+            column = columns[slot] + columns_speeds[slot]
+            drawn_row, drawn_column = round(row), round(column)
+            if age > lifetimes[slot] or not (0 < drawn_row <= max_row and 0 < drawn_column <= max_column):
+                free_slots.append(slot)
+                continue
+            ages[slot], rows[slot], columns[slot] = age, row, column
+            canvas.addstr(drawn_row, drawn_column, GLYPHS_BY_AGE[(age - 1) * glyphs_amount // lifetimes[slot]])
+            live_slots.append(slot)
+            drawn_cells.append((drawn_row, drawn_column))
+
+        self._live_slots = live_slots
+        self._drawn_cells = drawn_cells
+
+
+async def animate_particles(canvas, particles):
+    """Animate all particles of the system, tic by tic."""
+
+    while True:
+        particles.update(canvas)
+        await sleep()
@@ -1,4 +1,5 @@
 import math
+from array import array
 
 
 def _limit(value, min_value, max_value):
@@ -73,3 +74,49 @@ def update_speed(row_speed, column_speed, rows_direction, columns_direction, row
         column_speed = _apply_acceleration(column_speed, column_speed_limit, columns_direction > 0)
 
     return row_speed, column_speed
+
+
+def _check_directions(name, directions):
+    wrong_directions = set(directions) - {-1, 0, 1}
+    if wrong_directions:
+        raise ValueError(f'Wrong {name} values {sorted(wrong_directions)}. Expects -1, 0 or 1.')
+
+
+def _update_axis_speeds(speeds, directions, speed_limit, fading):
+    speed_limit = abs(speed_limit)
+    cos = math.cos
+    updated_speeds = []
+    for speed, direction in zip(speeds, directions):
+        speed *= fading
+        if direction:
+            speed += direction * cos(speed / speed_limit) * 0.75
+            if speed < -speed_limit:
+                speed = -speed_limit
+            elif speed > speed_limit:
+                speed = speed_limit
+            if -0.1 < speed < 0.1:
+                speed = 0.0
+        updated_speeds.append(speed)
+    speeds[:] = array('d', updated_speeds)
+
+
+def update_speeds(row_speeds, column_speeds, rows_directions, columns_directions, row_speed_limit=2,
+                  column_speed_limit=2, fading=0.8):
+    """Update speeds of many ships at once, the same way update_speed() does for one.
+
+    row_speeds and column_speeds are arrays of float, changed in place.
+    Direction sequences hold -1, 0 or 1 for every ship, they are checked
+    once for the whole batch instead of once per ship.
+    """
+
+    if not len(row_speeds) == len(column_speeds) == len(rows_directions) == len(columns_directions):
+        raise ValueError('Speeds and directions should have the same length.')
+
+    _check_directions('rows_directions', rows_directions)
+    _check_directions('columns_directions', columns_directions)
+
+    if fading < 0 or fading > 1:
+        raise ValueError(f'Wrong fading value {fading}. Expects float between 0 and 1.')
+
+    _update_axis_speeds(row_speeds, rows_directions, row_speed_limit, fading)
+    _update_axis_speeds(column_speeds, columns_directions, column_speed_limit, fading)
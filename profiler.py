@@ -0,0 +1,139 @@
+import csv
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from scheduler import sleep
+
+
+HISTOGRAM_BUCKET_PERCENTS = 10
+# Last bucket collects all tics taking twice the timeout or longer
+HISTOGRAM_BUCKETS_AMOUNT = 21
+
+
+class TicProfiler:
+    """Collect wall time spent in every tic by each coroutine type and by sections of the game loop.
+
+    Total tic times are also counted in a histogram of TIC_TIMEOUT percents.
+    """
+
+    def __init__(self, tic_timeout):
+        self.tic_timeout = tic_timeout
+        self.tics = 0
+        self.calls = defaultdict(int)
+        self.total_times = defaultdict(float)
+        self.max_times = defaultdict(float)
+        self.last_tic_times = {}
+        self.tic_times_histogram = [0] * HISTOGRAM_BUCKETS_AMOUNT
+        self._tic_times = defaultdict(float)
+        self._tic_started_at = time.perf_counter()
+
+    def start_tic(self):
+        self._tic_started_at = time.perf_counter()
+
+    def add(self, name, seconds):
+        self._tic_times[name] += seconds
+        self.calls[name] += 1
+
+    @contextmanager
+    def measure(self, name):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started_at)
+
+    def finish_tic(self):
+        tic_time = time.perf_counter() - self._tic_started_at
+        self.add('tic', tic_time)
+        self.tics += 1
+
+        for name, seconds in self._tic_times.items():
+            self.total_times[name] += seconds
+            if seconds > self.max_times[name]:
+                self.max_times[name] = seconds
+        self.last_tic_times = dict(self._tic_times)
+        self._tic_times.clear()
+
+        bucket = int(tic_time / self.tic_timeout * 100 // HISTOGRAM_BUCKET_PERCENTS)
+        self.tic_times_histogram[min(bucket, HISTOGRAM_BUCKETS_AMOUNT - 1)] += 1
+
+    def get_stats(self):
+        """Return stats of every coroutine type and loop section, the slowest first."""
+
+        return [
+            {
+                'name': name,
+                'calls': self.calls[name],
+                'total_ms': total_time * 1000,
+                'mean_tic_ms': total_time / self.tics * 1000 if self.tics else 0.0,
+                'max_tic_ms': self.max_times[name] * 1000,
+            }
+            for name, total_time in sorted(self.total_times.items(), key=lambda item: -item[1])
+        ]
+
+    def get_histogram(self):
+        histogram = []
+        for bucket, tics in enumerate(self.tic_times_histogram):
+            from_percent = bucket * HISTOGRAM_BUCKET_PERCENTS
+            to_percent = from_percent + HISTOGRAM_BUCKET_PERCENTS
+            if bucket == HISTOGRAM_BUCKETS_AMOUNT - 1:
+                to_percent = None
+            histogram.append({'from_percent': from_percent, 'to_percent': to_percent, 'tics': tics})
+        return histogram
+
+    def dump(self, path):
+        """Save stats to JSON file, or to CSV file if path ends with .csv."""
+
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(['name', 'calls', 'total_ms', 'mean_tic_ms', 'max_tic_ms'])
+                for stats in self.get_stats():
+                    writer.writerow([
+                        stats['name'],
+                        stats['calls'],
+                        f'{stats["total_ms"]:.3f}',
+                        f'{stats["mean_tic_ms"]:.3f}',
+                        f'{stats["max_tic_ms"]:.3f}',
+                    ])
+                for bucket in self.get_histogram():
+                    to_percent = bucket['to_percent'] or ''
+                    writer.writerow([f'tic_time_{bucket["from_percent"]}-{to_percent}%', bucket['tics'], '', '', ''])
+            return
+
+        with open(path, 'w') as json_file:
+            json.dump(
+                {
+                    'tic_timeout_ms': self.tic_timeout * 1000,
+                    'tics': self.tics,
+                    'stats': self.get_stats(),
+                    'tic_time_histogram': self.get_histogram(),
+                },
+                json_file,
+                indent=2,
+            )
+
+
+async def show_profile(canvas, profiler, lines_amount=6, window_columns=36):
+    """Display time of the last tic and of the slowest coroutine types in the upper left corner."""
+
+    window = canvas.derwin(lines_amount + 1, window_columns, 1, 1)
+
+    while True:
+        tic_times = profiler.last_tic_times
+        lines = [
+            f'tic {tic_times.get("tic", 0) * 1000:6.1f} ms of {profiler.tic_timeout * 1000:.0f} ms'
+        ]
+        slowest = sorted(
+            (item for item in tic_times.items() if item[0] != 'tic'),
+            key=lambda item: -item[1],
+        )
+        for name, seconds in slowest[:lines_amount]:
+            lines.append(f'{name[:22]:<22} {seconds * 1000:6.2f} ms')
+        lines.extend([''] * (lines_amount + 1 - len(lines)))
+
+        for row, line in enumerate(lines):
+            window.addstr(row, 0, line.ljust(window_columns - 1))
+        await sleep()
@@ -0,0 +1,134 @@
+from array import array
+from itertools import compress
+
+
+DEFAULT_CAPACITY = 1024
+# Symbols shown at the muzzle on the first tics of a shot, before it starts flying
+MUZZLE_FLASH = '*O'
+
+
+class ProjectilePool:
+    """Projectiles kept column-wise in arrays allocated once, all moved in one pass per tic.
+
+    Every projectile takes a free slot of the pool. Launching more
+    projectiles than the pool capacity does nothing, so a game can't
+    grow the pool without limit by holding the trigger.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.rows = array('d', [0]) * capacity
+        self.columns = array('d', [0]) * capacity
+        self.rows_speeds = array('d', [0]) * capacity
+        self.columns_speeds = array('d', [0]) * capacity
+        self.ages = array('l', [0]) * capacity
+        self.symbols = bytearray(capacity)
+        self.alive = bytearray(capacity)
+        self._free_slots = list(reversed(range(capacity)))
+        self._drawn_cells = []
+
+    def __len__(self):
+        return self.capacity - len(self._free_slots)
+
+    def launch(self, row, column, rows_speed=-0.5, columns_speed=0):
+        """Take a slot for a new projectile. Return False if the pool is full."""
+
+        if not self._free_slots:
+            return False
+
+        slot = self._free_slots.pop()
+        self.rows[slot], self.columns[slot] = row, column
+        self.rows_speeds[slot], self.columns_speeds[slot] = rows_speed, columns_speed
+        self.ages[slot] = 0
+        self.symbols[slot] = ord('|' if abs(columns_speed) < abs(rows_speed) else '-')
+        self.alive[slot] = 1
+        return True
+
+    def _free(self, slot):
+        self.alive[slot] = 0
+        self._free_slots.append(slot)
+
+    def clear(self):
+        for slot in compress(range(self.capacity), self.alive):
+            self._free(slot)
+
+    def update(self, canvas, obstacles, on_hit):
+        """Move all projectiles, test them against obstacle store and draw them on canvas.
+
+        Projectiles leaving the canvas borders or hitting an obstacle are
+        freed. Every obstacle hit is passed to on_hit(obstacle) once.
+        """
+
+        for row, column, _ in self._drawn_cells:
+            canvas.addstr(row, column, ' ')
+
+        rows_number, columns_number = canvas.getmaxyx()
+        max_row, max_column = rows_number - 1, columns_number - 1
+        rows, columns = self.rows, self.columns
+        rows_speeds, columns_speeds = self.rows_speeds, self.columns_speeds
+        ages, symbols = self.ages, self.symbols
+        muzzle_flash_tics = len(MUZZLE_FLASH)
+
+        drawn_cells = []
+        flying_slots = []
+        points = []
+        for slot in compress(range(self.capacity), self.alive):
+            age = ages[slot]
+            ages[slot] = age + 1
+            if age < muzzle_flash_tics:
+                drawn_cells.append((round(rows[slot]), round(columns[slot]), MUZZLE_FLASH[age]))
+                continue
+
+            row = rows[slot] + rows_speeds[slot]
+            column = columns[slot] + columns_speeds[slot]
+            if not (0 < row < max_row and 0 < column < max_column):
+                self._free(slot)
+                continue
+            rows[slot], columns[slot] = row, column
+            flying_slots.append(slot)
+            points.append((row, column))
+
+        for slot, (row, column), obstacle in zip(flying_slots, points, obstacles.collide_points(points)):
+            if obstacle is None:
+                drawn_cells.append((round(row), round(column), chr(symbols[slot])))
+                continue
+            self._free(slot)
+            if obstacle in obstacles:
+                # Obstacle may be already destroyed by another projectile
+                on_hit(obstacle)
+
+        for row, column, symbol in drawn_cells:
+            canvas.addstr(row, column, symbol)
+        self._drawn_cells = drawn_cells
+
+
+class Gun:
+    """Launch volleys of projectiles, no more often than once in fire_interval_tics.
+
+    Projectiles of a volley fan out evenly, columns speed of the side
+    ones is spread, so the spread of 0 makes all of them fly straight.
+    """
+
+    def __init__(self, projectiles, fire_interval_tics=1, volley_size=1, spread=0, rows_speed=-0.5):
+        self.projectiles = projectiles
+        self.fire_interval_tics = fire_interval_tics
+        self.volley_size = volley_size
+        self.spread = spread
+        self.rows_speed = rows_speed
+        self._ready_tic = 0
+
+    def fire(self, row, column, tic):
+        """Launch a volley at a given tic if the gun is ready. Return amount of launched projectiles."""
+
+        if tic < self._ready_tic:
+            return 0
+        self._ready_tic = tic + self.fire_interval_tics
+
+        launched = 0
+        for number in range(self.volley_size):
+            if self.volley_size > 1:
+                columns_speed = self.spread * (2 * number / (self.volley_size - 1) - 1)
+            else:
+                columns_speed = 0
+            launched += self.projectiles.launch(row, column, self.rows_speed, columns_speed)
+        return launched
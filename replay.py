@@ -0,0 +1,83 @@
+"""Recording of the rocket controls, to replay a game exactly as it was played.
+
+Input log is a text file. The first line is a JSON header with random seed,
+screen size, world width and scenario of the game, every next line is a run of equal controls:
+rows direction, columns direction, space pressed flag and amount of tics.
+"""
+import json
+from itertools import groupby, repeat
+
+from curses_tools import read_controls
+
+
+# Bump whenever the same seed and controls stop giving the same game, e.g. random
+# numbers are drawn in another order, so logs of older versions are rejected
+INPUT_LOG_VERSION = 2
+IDLE_CONTROLS = (0, 0, False)
+
+
+class ControlsRecorder:
+    """Read controls from canvas, keeping them in the log, one entry per tic."""
+
+    def __init__(self, read=read_controls):
+        self._read = read
+        self.controls_log = []
+        self.screen_size = None
+
+    def __call__(self, canvas):
+        if self.screen_size is None:
+            self.screen_size = canvas.getmaxyx()
+        controls = self._read(canvas)
+        self.controls_log.append(controls)
+        return controls
+
+
+class ControlsReplayer:
+    """Return controls from the log one entry per tic, staying idle after the log ends."""
+
+    def __init__(self, controls_log):
+        self._controls = iter(controls_log)
+
+    def __call__(self, canvas):
+        return next(self._controls, IDLE_CONTROLS)
+
+
+def save_input_log(path, seed, rows_number, columns_number, controls_log, world_screens=1, scenario_path=None):
+    header = {
+        'version': INPUT_LOG_VERSION,
+        'seed': seed,
+        'rows': rows_number,
+        'columns': columns_number,
+        'world_screens': world_screens,
+    }
+    if scenario_path is not None:
+        header['scenario'] = scenario_path
+    with open(path, 'w') as log_file:
+        log_file.write(json.dumps(header) + '\n')
+        for controls, same_controls in groupby(controls_log):
+            rows_direction, columns_direction, space_pressed = controls
+            tics = sum(1 for _ in same_controls)
+            log_file.write(f'{rows_direction} {columns_direction} {int(space_pressed)} {tics}\n')
+
+
+def load_input_log(path):
+    """Read input log. Return its header dict and list of per tic controls."""
+
+    with open(path, 'r') as log_file:
+        header = json.loads(log_file.readline())
+        if header.get('version') != INPUT_LOG_VERSION:
+            raise ValueError(
+                f'Unsupported input log version {header.get("version")}, '
+                f'this game replays version {INPUT_LOG_VERSION}.'
+            )
+        world_screens = header.get('world_screens', 1)
+        if not isinstance(world_screens, int) or world_screens < 1:
+            raise ValueError(f'Wrong world_screens value {world_screens!r}, expects 1 or more.')
+
+        controls_log = []
+        for line in log_file:
+            rows_direction, columns_direction, space_pressed, tics = map(int, line.split())
+            controls = (rows_direction, columns_direction, bool(space_pressed))
+            controls_log.extend(repeat(controls, tics))
+
+    return header, controls_log
@@ -0,0 +1,87 @@
+import heapq
+from itertools import count
+from time import perf_counter
+
+
+class _Sleep:
+
+    def __init__(self, tics):
+        self.tics = tics
+
+    def __await__(self):
+        yield self.tics
+
+
+async def sleep(tics=1):
+    """Suspend coroutine for given amount of tics."""
+
+    if tics > 0:
+        await _Sleep(tics)
+
+
+class Scheduler:
+    """Run coroutines tic by tic, resuming only those whose sleep is over.
+
+    Coroutines wait in a min-heap keyed by the tic they should wake up on,
+    so sleeping coroutines cost nothing until they are due. Coroutines which
+    await asyncio.sleep(0) yield None and are resumed on the next tic.
+    """
+
+    def __init__(self):
+        self.tic = 0
+        # Optional TicProfiler, measuring time spent in every coroutine
+        self.profiler = None
+        self._queue = []
+        self._order = count()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def spawn(self, coroutine):
+        """Add coroutine to be started on the next run_tic() call."""
+
+        heapq.heappush(self._queue, (self.tic, next(self._order), coroutine))
+
+    def _pop_due_coroutines(self):
+        queue = self._queue
+        due_coroutines = []
+        while queue and queue[0][0] <= self.tic:
+            due_coroutines.append(heapq.heappop(queue)[2])
+        return due_coroutines
+
+    def run_tic(self):
+        if self.profiler is not None:
+            self._run_profiled_tic()
+            return
+
+        queue = self._queue
+        for coroutine in self._pop_due_coroutines():
+            try:
+                tics = coroutine.send(None)
+            except StopIteration:
+                continue
+            heapq.heappush(queue, (self.tic + (tics or 1), next(self._order), coroutine))
+
+        self.tic += 1
+
+    def _run_profiled_tic(self):
+        queue = self._queue
+        add_time = self.profiler.add
+        for coroutine in self._pop_due_coroutines():
+            started_at = perf_counter()
+            try:
+                tics = coroutine.send(None)
+            except StopIteration:
+                continue
+            finally:
+                add_time(coroutine.__name__, perf_counter() - started_at)
+            heapq.heappush(queue, (self.tic + (tics or 1), next(self._order), coroutine))
+
+        self.tic += 1
+
+    def close(self):
+        """Close all coroutines left in the scheduler."""
+
+        for _, _, coroutine in self._queue:
+            coroutine.close()
+        self._queue.clear()
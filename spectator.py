@@ -0,0 +1,57 @@
+"""Watch the game running with --spectate-port option from another terminal.
+
+Usage:
+    python3 spectator.py --port 8765
+"""
+import argparse
+import asyncio
+import curses
+
+from spectator_server import DEFAULT_HOST, DEFAULT_PORT, read_message
+
+
+QUIT_KEY_CODES = (ord('q'), ord('Q'))
+
+
+def draw_runs(window, runs):
+    rows_number, columns_number = window.getmaxyx()
+    for row, column, text, attributes in runs:
+        if row >= rows_number or column >= columns_number:
+            continue
+        text = text[:columns_number - column]
+        if row == rows_number - 1 and column + len(text) == columns_number:
+            # Curses can't draw in the lower right corner of the window
+            text = text[:-1]
+        if text:
+            window.addstr(row, column, text, attributes)
+
+
+async def watch(window, host, port):
+    curses.curs_set(False)
+    window.nodelay(True)
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while window.getch() not in QUIT_KEY_CODES:
+            message = await read_message(reader)
+            if message['keyframe']:
+                window.erase()
+            draw_runs(window, message['runs'])
+            window.refresh()
+    except asyncio.IncompleteReadError:
+        pass
+    finally:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Watch the game streamed by spectator server. Press Q to quit.')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='spectator server host')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='spectator server port')
+    args = parser.parse_args()
+
+    curses.wrapper(lambda window: asyncio.run(watch(window, args.host, args.port)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""Local TCP server streaming the game screen to spectators.
+
+Every message is a frame: message length and kind, followed by zlib
+compressed payload. Keyframe payload holds tic number and screen size,
+delta payload holds only tic number. Both continue with runs of symbols:
+row, column, attributes, length of UTF-8 text and the text itself.
+Spectators get a keyframe rendered right after they connect and deltas after it.
+"""
+import asyncio
+import struct
+import threading
+import zlib
+from collections import deque
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+KEYFRAME_INTERVAL_TICS = 50
+# Deltas waiting for a slow spectator, more of them are dropped until the next keyframe
+MAX_PENDING_MESSAGES = 20
+WRITE_BUFFER_LIMIT = 64 * 1024
+
+KEYFRAME = 1
+DELTA = 2
+
+FRAME_HEADER = struct.Struct('<IB')
+KEYFRAME_HEADER = struct.Struct('<IHH')
+DELTA_HEADER = struct.Struct('<I')
+RUN_HEADER = struct.Struct('<HHIH')
+
+
+def encode_runs(runs):
+    chunks = []
+    for row, column, text, attributes in runs:
+        text_bytes = text.encode()
+        chunks.append(RUN_HEADER.pack(row, column, attributes, len(text_bytes)))
+        chunks.append(text_bytes)
+    return b''.join(chunks)
+
+
+def decode_runs(payload, offset):
+    runs = []
+    while offset < len(payload):
+        row, column, attributes, length = RUN_HEADER.unpack_from(payload, offset)
+        offset += RUN_HEADER.size
+        runs.append((row, column, payload[offset:offset + length].decode(), attributes))
+        offset += length
+    return runs
+
+
+def pack_message(kind, payload):
+    compressed_payload = zlib.compress(payload, 1)
+    return FRAME_HEADER.pack(len(compressed_payload), kind) + compressed_payload
+
+
+def encode_keyframe(tic, rows_number, columns_number, runs):
+    return pack_message(KEYFRAME, KEYFRAME_HEADER.pack(tic, rows_number, columns_number) + encode_runs(runs))
+
+
+def encode_delta(tic, runs):
+    return pack_message(DELTA, DELTA_HEADER.pack(tic) + encode_runs(runs))
+
+
+def decode_message(kind, compressed_payload):
+    """Return dict with tic, runs and, for keyframes, screen size."""
+
+    payload = zlib.decompress(compressed_payload)
+    if kind == KEYFRAME:
+        tic, rows_number, columns_number = KEYFRAME_HEADER.unpack_from(payload)
+        runs = decode_runs(payload, KEYFRAME_HEADER.size)
+        return {'keyframe': True, 'tic': tic, 'size': (rows_number, columns_number), 'runs': runs}
+
+    tic, = DELTA_HEADER.unpack_from(payload)
+    return {'keyframe': False, 'tic': tic, 'runs': decode_runs(payload, DELTA_HEADER.size)}
+
+
+async def read_message(reader):
+    """Read one message from the stream. Return decoded dict."""
+
+    kind_and_length = await reader.readexactly(FRAME_HEADER.size)
+    length, kind = FRAME_HEADER.unpack(kind_and_length)
+    return decode_message(kind, await reader.readexactly(length))
+
+
+class _Spectator:
+    """Messages queued for one spectator.
+
+    If the spectator can't keep up, queued deltas are dropped and it waits
+    for the next keyframe, so slow spectators cost the game nothing.
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.pending_messages = deque()
+        # Deltas make sense only on top of the screen sent before, so a new spectator starts from a keyframe
+        self.waiting_keyframe = True
+        self.has_messages = asyncio.Event()
+        self.dropped_messages = 0
+
+    def send(self, delta, keyframe=None):
+        if not self.waiting_keyframe and len(self.pending_messages) >= MAX_PENDING_MESSAGES:
+            self.dropped_messages += len(self.pending_messages)
+            self.pending_messages.clear()
+            self.waiting_keyframe = True
+
+        if self.waiting_keyframe:
+            if keyframe is None:
+                self.dropped_messages += 1
+                return
+            self.pending_messages.append(keyframe)
+            self.waiting_keyframe = False
+        else:
+            self.pending_messages.append(delta)
+        self.has_messages.set()
+
+    async def run(self):
+        while True:
+            await self.has_messages.wait()
+            self.has_messages.clear()
+            while self.pending_messages:
+                self.writer.write(self.pending_messages.popleft())
+            await self.writer.drain()
+
+
+class SpectatorServer:
+    """Asyncio TCP server, working in its own thread, so it never blocks the game loop."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.spectators = set()
+        # Set when a spectator joins, the game sends a keyframe with the next render then
+        self.keyframe_requested = False
+        self._loop = None
+        self._started = threading.Event()
+        self._start_error = None
+
+    def start(self):
+        """Start the server thread, raise OSError if the server can't listen on its port."""
+
+        thread = threading.Thread(target=asyncio.run, args=(self._serve(),), daemon=True)
+        thread.start()
+        self._started.wait()
+        if self._start_error is not None:
+            raise self._start_error
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        try:
+            server = await asyncio.start_server(self._handle_spectator, self.host, self.port)
+        except OSError as error:
+            self._start_error = error
+            return
+        finally:
+            self._started.set()
+        self.port = server.sockets[0].getsockname()[1]
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_spectator(self, reader, writer):
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_LIMIT)
+        spectator = _Spectator(writer)
+        self.spectators.add(spectator)
+        self.keyframe_requested = True
+        try:
+            await spectator.run()
+        except ConnectionError:
+            pass
+        finally:
+            self.spectators.discard(spectator)
+            writer.close()
+
+    def _broadcast(self, delta, keyframe):
+        for spectator in self.spectators:
+            spectator.send(delta, keyframe)
+
+    def publish(self, delta, keyframe=None):
+        """Send encoded delta, and optionally keyframe of the same tic, to all spectators.
+
+        Safe to call from the game thread, the messages are handed over
+        to the server thread.
+        """
+
+        self._loop.call_soon_threadsafe(self._broadcast, delta, keyframe)
+
+
+class FrameBroadcaster:
+    """Frame buffer observer, encoding screen changes for spectator server once per tic."""
+
+    def __init__(self, server, keyframe_interval_tics=KEYFRAME_INTERVAL_TICS):
+        self.server = server
+        self.keyframe_interval_tics = keyframe_interval_tics
+        self.tic = 0
+
+    def __call__(self, frame_buffer, runs):
+        keyframe = None
+        if self.tic % self.keyframe_interval_tics == 0 or self.server.keyframe_requested:
+            self.server.keyframe_requested = False
+            keyframe = encode_keyframe(
+                self.tic,
+                frame_buffer.rows_number,
+                frame_buffer.columns_number,
+                frame_buffer.get_shown_runs(),
+            )
+        self.server.publish(encode_delta(self.tic, runs), keyframe)
+        self.tic += 1
@@ -0,0 +1,80 @@
+import curses
+
+from scheduler import sleep
+
+
+STAR_SYMBOLS = '+*:.'
+# Stars per cell of the screen within borders
+STARS_DENSITY = 0.015
+
+
+def get_blink_phases(offset_tics):
+    """Return (attributes, tics) phases of a star blinking cycle."""
+
+    return (
+        (curses.A_DIM, 20 + offset_tics),
+        (curses.A_NORMAL, 3),
+        (curses.A_BOLD, 5),
+        (curses.A_NORMAL, 3),
+    )
+
+
+class StarField:
+    """Blinking stars, living in the background layer of a frame buffer.
+
+    Stars are grouped by length of their blinking cycle. For every tic of
+    a cycle the group keeps a table of stars changing attributes on that tic,
+    so a tic of the star field touches only the stars which blink in it.
+    """
+
+    def __init__(self, stars):
+        self.stars = list(stars)
+        self._phase_tables = {}
+
+        for row, column, symbol, offset_tics in self.stars:
+            phases = get_blink_phases(offset_tics)
+            cycle_tics = sum(tics for _, tics in phases)
+            phase_table = self._phase_tables.setdefault(cycle_tics, [[] for _ in range(cycle_tics)])
+
+            phase_start_tic = 0
+            for attributes, tics in phases:
+                phase_table[phase_start_tic].append((row, column, ord(symbol), attributes))
+                phase_start_tic += tics
+
+    def __len__(self):
+        return len(self.stars)
+
+    @classmethod
+    def generate(cls, rng, rows_number, columns_number, amount=None, density=STARS_DENSITY):
+        """Scatter stars within borders of the screen, their amount depends on screen area by default."""
+
+        if amount is None:
+            amount = int((rows_number - 2) * (columns_number - 2) * density)
+        return cls(
+            (
+                rng.randint(1, rows_number - 2),
+                rng.randint(1, columns_number - 2),
+                rng.choice(STAR_SYMBOLS),
+                rng.randint(3, 12),
+            )
+            for _ in range(amount)
+        )
+
+    def update(self, frame_buffer, tic):
+        """Change attributes of the stars blinking on given tic."""
+
+        put_background = frame_buffer.put_background
+        for cycle_tics, phase_table in self._phase_tables.items():
+            for row, column, symbol, attributes in phase_table[tic % cycle_tics]:
+                put_background(row, column, symbol, attributes)
+
+
+async def blink_stars(frame_buffer, star_field, governor=None):
+    """Display animation of blinking stars, holding it while load governor asks for still stars."""
+
+    tic = 0
+    while True:
+        if governor is None or governor.stars_blink:
+            star_field.update(frame_buffer, tic)
+        await sleep()
+        tic += 1
@@ -0,0 +1,123 @@
+"""Property tests of batched update_speeds() against update_speed() of one ship.
+
+Run from the project directory:
+    python3 -m unittest discover tests
+"""
+import random
+import unittest
+from array import array
+
+from physics import update_speed, update_speeds
+
+
+BATCHES_AMOUNT = 2000
+MAX_SHIPS_AMOUNT = 40
+TICS_AMOUNT = 6
+DIRECTIONS = (-1, 0, 1)
+
+
+def update_one_by_one(row_speeds, column_speeds, rows_directions, columns_directions, *args):
+    return [
+        update_speed(row_speed, column_speed, rows_direction, columns_direction, *args)
+        for row_speed, column_speed, rows_direction, columns_direction
+        in zip(row_speeds, column_speeds, rows_directions, columns_directions)
+    ]
+
+
+class UpdateSpeedsTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def get_speed(self, limit):
+        # Mostly anywhere within and past the limit, sometimes right at the zero snap threshold
+        if self.rng.random() < 0.2:
+            return self.rng.choice((0, 0.1, -0.1, 0.1 / 0.8, -0.1 / 0.8, limit, -limit))
+        return self.rng.uniform(-2 * abs(limit), 2 * abs(limit))
+
+    def assert_bitwise_equal(self, row_speeds, column_speeds, expected_speeds, context):
+        """Compare float bits, not approximately, reporting only the first different ship."""
+
+        speeds = [(row_speed.hex(), column_speed.hex()) for row_speed, column_speed in zip(row_speeds, column_speeds)]
+        expected = [(float(row_speed).hex(), float(column_speed).hex()) for row_speed, column_speed in expected_speeds]
+        self.assertEqual(len(speeds), len(expected), context)
+        for ship, (ship_speeds, expected_ship_speeds) in enumerate(zip(speeds, expected)):
+            if ship_speeds != expected_ship_speeds:
+                self.fail(f'{context}, ship {ship}: {ship_speeds} != {expected_ship_speeds}')
+
+    def assert_same_as_one_by_one(self, ships_amount, row_speed_limit, column_speed_limit, fading):
+        rng = self.rng
+        row_speeds = array('d', (self.get_speed(row_speed_limit) for _ in range(ships_amount)))
+        column_speeds = array('d', (self.get_speed(column_speed_limit) for _ in range(ships_amount)))
+        rows_directions = [rng.choice(DIRECTIONS) for _ in range(ships_amount)]
+        columns_directions = [rng.choice(DIRECTIONS) for _ in range(ships_amount)]
+        limits_and_fading = (row_speed_limit, column_speed_limit, fading)
+
+        for tic in range(TICS_AMOUNT):
+            expected_speeds = update_one_by_one(
+                row_speeds, column_speeds, rows_directions, columns_directions, *limits_and_fading,
+            )
+            update_speeds(row_speeds, column_speeds, rows_directions, columns_directions, *limits_and_fading)
+            self.assert_bitwise_equal(row_speeds, column_speeds, expected_speeds, f'tic {tic}, {limits_and_fading}')
+
+            # Ships change directions now and then, as players do
+            for ship in range(ships_amount):
+                if rng.random() < 0.3:
+                    rows_directions[ship] = rng.choice(DIRECTIONS)
+                    columns_directions[ship] = rng.choice(DIRECTIONS)
+
+    def test_random_batches(self):
+        rng = self.rng
+        for _ in range(BATCHES_AMOUNT):
+            self.assert_same_as_one_by_one(
+                rng.randint(0, MAX_SHIPS_AMOUNT),
+                rng.choice((0.5, 1, 2, 3, rng.uniform(0.2, 5))),
+                rng.choice((0.5, 1, 2, 3, rng.uniform(0.2, 5))),
+                rng.choice((0, 0.5, 0.8, 1, rng.random())),
+            )
+
+    def test_negative_limits(self):
+        for row_speed_limit, column_speed_limit in ((-2, 2), (2, -3), (-1, -0.5)):
+            self.assert_same_as_one_by_one(MAX_SHIPS_AMOUNT, row_speed_limit, column_speed_limit, 0.8)
+
+    def test_fading_bounds(self):
+        for fading in (0, 1):
+            self.assert_same_as_one_by_one(MAX_SHIPS_AMOUNT, 2, 2, fading)
+
+    def test_zero_snap_threshold(self):
+        # Speeds braking through zero in small steps, so results cross the threshold from both sides
+        ships_amount = 4000
+        row_speeds = array('d', (-0.9 + ship * 0.0001 for ship in range(ships_amount)))
+        column_speeds = array('d', [0]) * ships_amount
+        directions = [1] * ships_amount
+        expected_speeds = update_one_by_one(row_speeds, column_speeds, directions, directions, 2, 2, 1)
+        update_speeds(row_speeds, column_speeds, directions, directions, 2, 2, 1)
+
+        self.assert_bitwise_equal(row_speeds, column_speeds, expected_speeds, 'braking through zero')
+        self.assertIn(0, row_speeds)
+        self.assertTrue(any(0.1 <= abs(row_speed) < 0.1001 for row_speed in row_speeds))
+
+    def test_wrong_directions(self):
+        speeds = array('d', [0, 0])
+        with self.assertRaises(ValueError):
+            update_speeds(speeds, array('d', speeds), [0, 2], [0, 0])
+        with self.assertRaises(ValueError):
+            update_speeds(speeds, array('d', speeds), [0, 0], [-2, 0])
+
+    def test_wrong_fading(self):
+        speeds = array('d', [0])
+        for fading in (-0.1, 1.1):
+            with self.assertRaises(ValueError):
+                update_speeds(speeds, array('d', speeds), [0], [0], fading=fading)
+
+    def test_wrong_lengths(self):
+        with self.assertRaises(ValueError):
+            update_speeds(array('d', [0, 0]), array('d', [0]), [0, 0], [0, 0])
+
+    def test_empty_batch(self):
+        row_speeds, column_speeds = array('d'), array('d')
+        update_speeds(row_speeds, column_speeds, [], [])
+        self.assertEqual((len(row_speeds), len(column_speeds)), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+class Viewport:
+    """Window to the world wider than the screen, moving sideways after the object it follows.
+
+    Viewport mimics drawing methods of curses window, but takes world
+    coordinates, translates them to the screen ones and drops everything
+    outside the screen. getmaxyx() returns the world size.
+
+    Drawn objects erase themselves on the next tic at their world position,
+    which is a different screen position once the viewport has moved. So on
+    every move the viewport blanks all it has drawn since the previous move.
+    """
+
+    def __init__(self, canvas, world_columns_number):
+        self.canvas = canvas
+        self.rows_number, self.columns_number = canvas.getmaxyx()
+        self.world_columns_number = max(world_columns_number, self.columns_number)
+        self.left = 0
+        self._drawn_runs = []
+
+    def getmaxyx(self):
+        return self.rows_number, self.world_columns_number
+
+    def getch(self):
+        return self.canvas.getch()
+
+    def addstr(self, row, column, text, attributes=0):
+        if not 0 <= row < self.rows_number:
+            return
+
+        column -= self.left
+        if column < 0:
+            text = text[-column:]
+            column = 0
+        text = text[:self.columns_number - column]
+        if not text:
+            return
+
+        self.canvas.addstr(row, column, text, attributes)
+        if not text.isspace():
+            self._drawn_runs.append((row, column, len(text)))
+
+    def is_visible(self, row, column, rows_size=1, columns_size=1):
+        return (
+            row + rows_size > 0 and row < self.rows_number
+            and column + columns_size > self.left and column < self.left + self.columns_number
+        )
+
+    def follow(self, column):
+        """Move viewport to keep given world column in the middle of the screen, as far as the world allows.
+
+        Call it every tic before drawing the world.
+        """
+
+        max_left = self.world_columns_number - self.columns_number
+        left = min(max(round(column - self.columns_number / 2), 0), max_left)
+        if left != self.left:
+            for row, column, length in self._drawn_runs:
+                self.canvas.addstr(row, column, ' ' * length)
+            self.left = left
+        self._drawn_runs.clear()